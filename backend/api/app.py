@@ -2,14 +2,31 @@
 FastAPI application for the trading bot dashboard with authentication
 Modern async API with automatic documentation
 """
+import asyncio
+import hmac
 import logging
-from typing import List, Optional
-from datetime import datetime, time as dt_time
-from fastapi import FastAPI, HTTPException, status
+import time
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List, Optional
+from datetime import datetime, timedelta, time as dt_time
+import bcrypt
+import numpy as np
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from models.database import get_session, Ticker, Trade, BotStatus, PriceCache, AdminSettings
-from config.settings import PORT, CORS_ORIGINS
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import and_, case, delete, func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.database import (
+    get_async_session, hash_passkey, BCRYPT_PREFIXES, Ticker, Trade, BotStatus, PriceCache, AdminSettings
+)
+from config.settings import PORT, CORS_ORIGINS, API_CACHE_TTL, API_WORKERS
 
 # Configure logging
 logging.basicConfig(
@@ -18,13 +35,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSON response that serializes naive datetimes as UTC and NumPy values natively"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=orjson_default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the admin passkey hash and render the API docs before serving requests"""
+    await load_passkey_hash()
+    build_static_docs()
+    yield
+
+
 # Initialize FastAPI app with automatic documentation
 app = FastAPI(
     title="Options Trading Bot API",
     description="Professional trading bot API with dark theme and authentication",
     version="2.0.0",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    # Schema and docs pages are rendered once at startup and served from memory below
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS Middleware
@@ -34,13 +82,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # Named explicitly: a "*" wildcard is not honoured for credentialed requests
+    expose_headers=["*", "X-Next-Before", "X-Next-Before-Id"],
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
+
+@app.exception_handler(SQLAlchemyError)
+async def database_error_handler(request: Request, exc: SQLAlchemyError):
+    """Turn database errors into a generic 500; the session dependency has already rolled back"""
+    logger.error(f"Database error on {request.method} {request.url.path}", exc_info=exc)
+    return FastJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "Database error"}
+    )
+
+
 # Global bot instance (will be set from main)
 bot_instance = None
 
+# Short-lived cache for polled aggregate endpoints: key -> (value, expires_at)
+_response_cache = {}
+
 
 def set_bot_instance(bot):
     """Set the global bot instance"""
@@ -48,15 +111,71 @@ def set_bot_instance(bot):
     bot_instance = bot
 
 
+def get_cached_response(key: str):
+    """Return a cached response value if it has not expired yet"""
+    value, expires_at = _response_cache.get(key, (None, 0.0))
+    if time.monotonic() < expires_at:
+        return value
+    return None
+
+
+def set_cached_response(key: str, value):
+    """Cache a response value for API_CACHE_TTL seconds"""
+    _response_cache[key] = (value, time.monotonic() + API_CACHE_TTL)
+    return value
+
+
+def invalidate_response_cache():
+    """Drop cached aggregates after a mutation that changes them"""
+    _response_cache.clear()
+
+
+async def get_db_session():
+    """Yield a request-scoped async session; closing it rolls back anything uncommitted"""
+    async with get_async_session() as session:
+        yield session
+
+
+@lru_cache(maxsize=7 * 24 * 60)
+def _is_market_minute(weekday: int, hour: int, minute: int) -> bool:
+    """Whether a (weekday, hour, minute) bucket falls inside regular market hours"""
+    if weekday >= 5:  # Saturday = 5, Sunday = 6
+        return False
+    return (9, 30) <= (hour, minute) < (16, 0)
+
+
 def is_market_open() -> bool:
     """Check if market is open (9:30 AM - 4:00 PM ET, Mon-Fri)"""
     now = datetime.now()
-    if now.weekday() >= 5:  # Saturday = 5, Sunday = 6
-        return False
-    market_open = dt_time(9, 30)
-    market_close = dt_time(16, 0)
-    current_time = now.time()
-    return market_open <= current_time <= market_close
+    return _is_market_minute(now.weekday(), now.hour, now.minute)
+
+
+async def get_trade_summary(session) -> dict:
+    """Compute trade counts, P&L totals and win/loss counts in a single aggregate query"""
+    # Bounds computed once per request; a range on the raw column stays index-friendly
+    today_start = datetime.combine(datetime.now().date(), dt_time.min)
+    today_end = today_start + timedelta(days=1)
+    entered_today = and_(Trade.entry_time >= today_start, Trade.entry_time < today_end)
+    closed = Trade.status == 'CLOSED'
+    
+    result = await session.execute(select(
+        func.count(Trade.id),
+        func.coalesce(func.sum(Trade.pnl), 0.0),
+        func.coalesce(func.sum(case((entered_today, Trade.pnl))), 0.0),
+        func.coalesce(func.sum(case((Trade.status == 'OPEN', 1), else_=0)), 0),
+        func.coalesce(func.sum(case((and_(closed, Trade.pnl > 0), 1), else_=0)), 0),
+        func.coalesce(func.sum(case((and_(closed, Trade.pnl.isnot(None)), 1), else_=0)), 0)
+    ))
+    total, total_pnl, today_pnl, open_positions, winning, closed_count = result.one()
+    
+    return {
+        "total_trades": total,
+        "total_pnl": total_pnl,
+        "today_pnl": today_pnl,
+        "open_positions": open_positions,
+        "winning_trades": winning,
+        "closed_trades": closed_count
+    }
 
 
 # ==================== PYDANTIC MODELS ====================
@@ -100,8 +219,7 @@ class TickerResponse(BaseModel):
     positions: int = 0
     pnl: float = 0.0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PositionResponse(BaseModel):
@@ -117,6 +235,8 @@ class PositionResponse(BaseModel):
     pnl_percent: float
     entry_time: str
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class TradeResponse(BaseModel):
     """Trade response"""
@@ -131,6 +251,8 @@ class TradeResponse(BaseModel):
     pnl: Optional[float] = None
     timestamp: str
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class BotStatusResponse(BaseModel):
     """Bot status response"""
@@ -142,6 +264,8 @@ class BotStatusResponse(BaseModel):
     trades_count: int
     uptime: Optional[str] = None
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class StatsResponse(BaseModel):
     """Statistics response"""
@@ -151,16 +275,66 @@ class StatsResponse(BaseModel):
     total_trades: int
     open_positions: int
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class MessageResponse(BaseModel):
     """Generic message response"""
     message: str
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class ErrorResponse(BaseModel):
     """Error response"""
     error: str
 
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ==================== API DOCS ====================
+
+OPENAPI_URL = "/openapi.json"
+
+# Pre-rendered OpenAPI schema and docs pages: name -> bytes
+_static_docs = {}
+
+
+def build_static_docs():
+    """Render the OpenAPI schema and the Swagger/ReDoc pages once"""
+    _static_docs["openapi"] = orjson.dumps(app.openapi())
+    _static_docs["swagger"] = get_swagger_ui_html(
+        openapi_url=OPENAPI_URL, title=f"{app.title} - Swagger UI"
+    ).body
+    _static_docs["redoc"] = get_redoc_html(
+        openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc"
+    ).body
+
+
+def get_static_doc(name: str) -> bytes:
+    """Return a pre-rendered docs asset, rendering them if startup has not run"""
+    if name not in _static_docs:
+        build_static_docs()
+    return _static_docs[name]
+
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json():
+    """Serve the cached OpenAPI schema"""
+    return Response(content=get_static_doc("openapi"), media_type="application/json")
+
+
+@app.get("/api/docs", include_in_schema=False)
+async def swagger_docs():
+    """Serve the cached Swagger UI page"""
+    return HTMLResponse(content=get_static_doc("swagger"))
+
+
+@app.get("/api/redoc", include_in_schema=False)
+async def redoc_docs():
+    """Serve the cached ReDoc page"""
+    return HTMLResponse(content=get_static_doc("redoc"))
+
 
 # ==================== ROOT & HEALTH ====================
 
@@ -189,127 +363,102 @@ async def health_check():
 
 # ==================== AUTHENTICATION ====================
 
+def verify_passkey(passkey: str, passkey_hash: str) -> bool:
+    """Check a passkey against its stored hash (blocking: run it in the threadpool)"""
+    if not passkey_hash.startswith(BCRYPT_PREFIXES):
+        # Legacy plaintext value that has not been upgraded yet
+        return hmac.compare_digest(passkey.encode(), passkey_hash.encode())
+    return bcrypt.checkpw(passkey.encode(), passkey_hash.encode())
+
+
+async def load_passkey_hash() -> str:
+    """Load the admin passkey hash (the database manager seeds and hashes it)
+
+    Held for API_CACHE_TTL seconds only, so a passkey changed through another API
+    worker stops validating here almost immediately.
+    """
+    passkey_hash = get_cached_response("passkey_hash")
+    if passkey_hash is None:
+        async with get_async_session() as session:
+            passkey_hash = (await session.execute(select(AdminSettings.passkey).limit(1))).scalar_one()
+        set_cached_response("passkey_hash", passkey_hash)
+    return passkey_hash
+
+
 @app.post("/api/auth/validate", tags=["Authentication"], status_code=status.HTTP_200_OK)
 async def validate_auth(payload: PasskeyValidation):
-    """Validate passkey against database"""
-    session = get_session()
-    try:
-        admin = session.query(AdminSettings).first()
-        if not admin:
-            # Initialize with default passkey if not exists
-            admin = AdminSettings(passkey='admin123')
-            session.add(admin)
-            session.commit()
-        
-        if payload.passkey == admin.passkey:
-            return {"valid": True}
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid passkey"
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error validating passkey: {e}")
+    """Validate passkey against the briefly cached passkey hash"""
+    passkey_hash = await load_passkey_hash()
+    
+    if not await run_in_threadpool(verify_passkey, payload.passkey, passkey_hash):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error validating passkey"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid passkey"
         )
-    finally:
-        session.close()
+    
+    return {"valid": True}
 
 
 @app.post("/api/auth/change-passkey", tags=["Authentication"], response_model=MessageResponse)
-async def change_passkey(payload: PasskeyChange):
-    """Change passkey (admin only) - stored in database"""
-    session = get_session()
-    try:
-        admin = session.query(AdminSettings).first()
-        if not admin:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Admin settings not found"
-            )
-        
-        # Verify current passkey
-        if payload.current_passkey != admin.passkey:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid current passkey"
-            )
-        
-        # Validate new passkey
-        if len(payload.new_passkey) < 6:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="New passkey must be at least 6 characters"
-            )
-        
-        # Update passkey in database
-        admin.passkey = payload.new_passkey
-        admin.updated_at = datetime.utcnow()
-        session.commit()
-        
-        logger.info("Passkey changed successfully (stored in database)")
-        
-        return {"message": "Passkey changed successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error changing passkey: {e}")
-        session.rollback()
+async def change_passkey(payload: PasskeyChange, session: AsyncSession = Depends(get_db_session)):
+    """Change passkey (admin only) - stored in database as a bcrypt hash"""
+    admin = (await session.execute(select(AdminSettings).limit(1))).scalars().first()
+    if not admin:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            detail="Admin settings not found"
+        )
+    
+    # Verify current passkey
+    if not await run_in_threadpool(verify_passkey, payload.current_passkey, admin.passkey):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid current passkey"
         )
-    finally:
-        session.close()
+    
+    # Validate new passkey
+    if len(payload.new_passkey) < 6:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="New passkey must be at least 6 characters"
+        )
+    
+    # Update passkey hash in database and in this worker's cache
+    admin.passkey = await run_in_threadpool(hash_passkey, payload.new_passkey)
+    admin.updated_at = datetime.utcnow()
+    await session.commit()
+    
+    set_cached_response("passkey_hash", admin.passkey)
+    
+    logger.info("Passkey changed successfully (stored in database)")
+    
+    return {"message": "Passkey changed successfully"}
 
 
 # ==================== BOT CONTROL ====================
 
-@app.get("/api/bot/status", tags=["Bot Control"], response_model=BotStatusResponse)
-async def get_bot_status():
+@app.get("/api/bot/status", tags=["Bot Control"], responses={200: {"model": BotStatusResponse}})
+async def get_bot_status(session: AsyncSession = Depends(get_db_session)):
     """Get bot status with comprehensive info"""
-    session = get_session()
-    try:
-        # Get bot running status
-        running = bot_instance.running if bot_instance else False
-        market_open = is_market_open()
-        
-        # Get trades for stats
-        all_trades = session.query(Trade).all()
-        today = datetime.now().date()
-        today_trades = [t for t in all_trades if t.entry_time and t.entry_time.date() == today]
-        
-        # Calculate P&L
-        total_pnl = sum(t.pnl for t in all_trades if t.pnl)
-        today_pnl = sum(t.pnl for t in today_trades if t.pnl)
-        
-        # Count positions and trades
-        open_positions = session.query(Trade).filter_by(status='OPEN').count()
-        total_trades = len(all_trades)
-        
-        return BotStatusResponse(
-            running=running,
-            market_open=market_open,
-            today_pnl=round(today_pnl, 2),
-            total_pnl=round(total_pnl, 2),
-            positions_count=open_positions,
-            trades_count=total_trades,
-            uptime=None
-        )
-        
-    except Exception as e:
-        logger.error(f"Error getting bot status: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-    finally:
-        session.close()
+    cached = get_cached_response("status")
+    if cached is not None:
+        return FastJSONResponse(cached)
+    
+    # Get bot running status
+    running = bot_instance.running if bot_instance else False
+    market_open = is_market_open()
+    
+    summary = await get_trade_summary(session)
+    
+    return FastJSONResponse(set_cached_response("status", {
+        "running": running,
+        "market_open": market_open,
+        "today_pnl": round(summary["today_pnl"], 2),
+        "total_pnl": round(summary["total_pnl"], 2),
+        "positions_count": summary["open_positions"],
+        "trades_count": summary["total_trades"],
+        "uptime": None
+    }))
 
 
 @app.post("/api/bot/start", tags=["Bot Control"], response_model=MessageResponse)
@@ -321,21 +470,14 @@ async def start_bot():
             detail="Bot not initialized"
         )
     
-    try:
-        if bot_instance.running:
-            return MessageResponse(message="Bot is already running")
-        
-        bot_instance.start()
-        logger.info("Bot started via API")
-        
-        return MessageResponse(message="Bot started successfully")
-        
-    except Exception as e:
-        logger.error(f"Error starting bot: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    if bot_instance.running:
+        return MessageResponse(message="Bot is already running")
+    
+    bot_instance.start()
+    logger.info("Bot started via API")
+    invalidate_response_cache()
+    
+    return MessageResponse(message="Bot started successfully")
 
 
 @app.post("/api/bot/stop", tags=["Bot Control"], response_model=MessageResponse)
@@ -347,408 +489,333 @@ async def stop_bot():
             detail="Bot not initialized"
         )
     
-    try:
-        if not bot_instance.running:
-            return MessageResponse(message="Bot is already stopped")
-        
-        bot_instance.stop()
-        logger.info("Bot stopped via API")
-        
-        return MessageResponse(message="Bot stopped successfully")
-        
-    except Exception as e:
-        logger.error(f"Error stopping bot: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    if not bot_instance.running:
+        return MessageResponse(message="Bot is already stopped")
+    
+    bot_instance.stop()
+    logger.info("Bot stopped via API")
+    invalidate_response_cache()
+    
+    return MessageResponse(message="Bot stopped successfully")
 
 
 # ==================== TICKER MANAGEMENT ====================
 
-@app.get("/api/tickers", tags=["Tickers"], response_model=List[TickerResponse])
+async def _fetch_all(statement) -> list:
+    """Run a read-only statement on its own pooled session so it can overlap with others"""
+    async with get_async_session() as session:
+        return (await session.execute(statement)).all()
+
+
+@app.get("/api/tickers", tags=["Tickers"], responses={200: {"model": List[TickerResponse]}})
 async def get_tickers():
     """Get all tickers with stats"""
-    session = get_session()
-    try:
-        tickers = session.query(Ticker).all()
-        result = []
-        
-        for t in tickers:
-            # Get positions and P&L for this ticker
-            ticker_trades = session.query(Trade).filter_by(ticker=t.symbol).all()
-            positions = len([tr for tr in ticker_trades if tr.status == 'OPEN'])
-            pnl = sum(tr.pnl for tr in ticker_trades if tr.pnl)
-            
-            result.append(TickerResponse(
-                symbol=t.symbol,
-                enabled=t.enabled,
-                threshold=t.threshold,
-                positions=positions,
-                pnl=round(pnl, 2)
-            ))
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error getting tickers: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-    finally:
-        session.close()
+    # Ticker rows and per-ticker trade aggregates are independent, so fetch them concurrently
+    tickers, stats_rows = await asyncio.gather(
+        _fetch_all(select(Ticker.symbol, Ticker.enabled, Ticker.threshold)),
+        _fetch_all(select(
+            Trade.ticker,
+            func.sum(case((Trade.status == 'OPEN', 1), else_=0)),
+            func.coalesce(func.sum(Trade.pnl), 0.0)
+        ).group_by(Trade.ticker))
+    )
+    stats = {symbol: (positions, pnl) for symbol, positions, pnl in stats_rows}
+    
+    result = []
+    for t in tickers:
+        positions, pnl = stats.get(t.symbol, (0, 0.0))
+        result.append({
+            "symbol": t.symbol,
+            "enabled": t.enabled,
+            "threshold": t.threshold,
+            "positions": positions,
+            "pnl": round(pnl, 2)
+        })
+    
+    return FastJSONResponse(result)
 
 
 @app.post("/api/tickers", tags=["Tickers"], response_model=TickerResponse, status_code=status.HTTP_201_CREATED)
-async def add_ticker(payload: TickerCreate):
+async def add_ticker(payload: TickerCreate, session: AsyncSession = Depends(get_db_session)):
     """Add a new ticker"""
-    session = get_session()
-    try:
-        symbol = payload.symbol.upper().strip()
-        
-        if not symbol:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Symbol is required"
-            )
-        
-        # Check if ticker already exists
-        existing = session.query(Ticker).filter_by(symbol=symbol).first()
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Ticker already exists"
-            )
-        
-        ticker = Ticker(
-            symbol=symbol,
-            enabled=payload.enabled,
-            threshold=payload.threshold,
-            max_positions=2,
-            capital_per_trade=500
+    symbol = payload.symbol.upper().strip()
+    
+    if not symbol:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Symbol is required"
         )
-        
-        session.add(ticker)
-        session.commit()
-        
-        logger.info(f"Added ticker: {symbol}")
-        
-        return TickerResponse(
-            symbol=ticker.symbol,
-            enabled=ticker.enabled,
-            threshold=ticker.threshold,
-            positions=0,
-            pnl=0.0
+    
+    # Check if ticker already exists
+    if (await session.execute(select(Ticker.id).where(Ticker.symbol == symbol))).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ticker already exists"
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error adding ticker: {e}")
-        session.rollback()
+    
+    ticker = Ticker(
+        symbol=symbol,
+        enabled=payload.enabled,
+        threshold=payload.threshold,
+        max_positions=2,
+        capital_per_trade=500
+    )
+    
+    session.add(ticker)
+    try:
+        await session.commit()
+    except IntegrityError:
+        # Added concurrently since the check above
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ticker already exists"
         )
-    finally:
-        session.close()
+    
+    logger.info(f"Added ticker: {symbol}")
+    
+    return TickerResponse.model_validate(ticker)
+
+
+async def _update_ticker_or_404(session, symbol: str, **values):
+    """Apply values to a ticker in one UPDATE ... RETURNING round-trip and commit"""
+    row = (await session.execute(
+        update(Ticker)
+        .where(Ticker.symbol == symbol.strip().upper())
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(Ticker.symbol, Ticker.enabled, Ticker.threshold)
+    )).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticker not found"
+        )
+    await session.commit()
+    return row
 
 
 @app.put("/api/tickers/{symbol}", tags=["Tickers"], response_model=TickerResponse)
-async def update_ticker(symbol: str, payload: TickerUpdate):
+async def update_ticker(symbol: str, payload: TickerUpdate, session: AsyncSession = Depends(get_db_session)):
     """Update a ticker by symbol"""
-    session = get_session()
-    try:
-        ticker = session.query(Ticker).filter_by(symbol=symbol.upper()).first()
-        if not ticker:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Ticker not found"
-            )
-        
-        if payload.enabled is not None:
-            ticker.enabled = payload.enabled
-        if payload.threshold is not None:
-            ticker.threshold = payload.threshold
-        if payload.max_positions is not None:
-            ticker.max_positions = payload.max_positions
-        if payload.capital_per_trade is not None:
-            ticker.capital_per_trade = payload.capital_per_trade
-        
-        ticker.updated_at = datetime.utcnow()
-        session.commit()
-        
-        logger.info(f"Updated ticker: {ticker.symbol}")
-        
-        return TickerResponse(
-            symbol=ticker.symbol,
-            enabled=ticker.enabled,
-            threshold=ticker.threshold,
-            positions=0,
-            pnl=0.0
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating ticker: {e}")
-        session.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-    finally:
-        session.close()
+    ticker = await _update_ticker_or_404(
+        session, symbol, **payload.model_dump(exclude_none=True)
+    )
+    
+    logger.info(f"Updated ticker: {ticker.symbol}")
+    
+    return TickerResponse.model_validate(ticker)
 
 
 @app.delete("/api/tickers/{symbol}", tags=["Tickers"], response_model=MessageResponse)
-async def delete_ticker(symbol: str):
+async def delete_ticker(symbol: str, session: AsyncSession = Depends(get_db_session)):
     """Delete a ticker by symbol"""
-    session = get_session()
-    try:
-        ticker = session.query(Ticker).filter_by(symbol=symbol.upper()).first()
-        if not ticker:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Ticker not found"
-            )
-        
-        session.delete(ticker)
-        session.commit()
-        
-        logger.info(f"Deleted ticker: {symbol}")
-        
-        return MessageResponse(message="Ticker deleted")
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error deleting ticker: {e}")
-        session.rollback()
+    result = await session.execute(delete(Ticker).where(Ticker.symbol == symbol.strip().upper()))
+    if not result.rowcount:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticker not found"
         )
-    finally:
-        session.close()
+    await session.commit()
+    
+    logger.info(f"Deleted ticker: {symbol}")
+    
+    return MessageResponse(message="Ticker deleted")
 
 
 @app.patch("/api/tickers/{symbol}/toggle", tags=["Tickers"], response_model=TickerResponse)
-async def toggle_ticker(symbol: str, payload: TickerToggle):
+async def toggle_ticker(symbol: str, payload: TickerToggle, session: AsyncSession = Depends(get_db_session)):
     """Toggle ticker enabled status"""
-    session = get_session()
-    try:
-        ticker = session.query(Ticker).filter_by(symbol=symbol.upper()).first()
-        if not ticker:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Ticker not found"
-            )
-        
-        ticker.enabled = payload.enabled
-        ticker.updated_at = datetime.utcnow()
-        session.commit()
-        
-        logger.info(f"Toggled ticker {symbol}: {ticker.enabled}")
-        
-        return TickerResponse(
-            symbol=ticker.symbol,
-            enabled=ticker.enabled,
-            threshold=ticker.threshold,
-            positions=0,
-            pnl=0.0
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error toggling ticker: {e}")
-        session.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-    finally:
-        session.close()
+    ticker = await _update_ticker_or_404(session, symbol, enabled=payload.enabled)
+    
+    logger.info(f"Toggled ticker {symbol}: {ticker.enabled}")
+    
+    return TickerResponse.model_validate(ticker)
 
 
 # ==================== POSITIONS ====================
 
-@app.get("/api/positions", tags=["Positions"], response_model=List[PositionResponse])
-async def get_positions():
+@app.get("/api/positions", tags=["Positions"], responses={200: {"model": List[PositionResponse]}})
+async def get_positions(session: AsyncSession = Depends(get_db_session)):
     """Get all open positions"""
-    session = get_session()
-    try:
-        trades = session.query(Trade).filter_by(status='OPEN').all()
-        
-        positions = []
-        for t in trades:
-            # Get current price (use exit_price as current for demo, or fetch from API)
-            current_price = t.exit_price if t.exit_price else t.entry_price
-            pnl = (current_price - t.entry_price) * t.quantity * 100
-            pnl_percent = ((current_price - t.entry_price) / t.entry_price) * 100 if t.entry_price else 0
-            
-            positions.append(PositionResponse(
-                id=str(t.id),
-                symbol=t.ticker,
-                option_type=t.option_type,
-                strike=t.strike,
-                entry_price=t.entry_price,
-                current_price=current_price,
-                quantity=t.quantity,
-                pnl=round(pnl, 2),
-                pnl_percent=round(pnl_percent, 2),
-                entry_time=t.entry_time.isoformat() if t.entry_time else ""
-            ))
-        
-        return positions
-        
-    except Exception as e:
-        logger.error(f"Error getting positions: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-    finally:
-        session.close()
+    rows = (await session.execute(select(
+        Trade.id, Trade.ticker, Trade.option_type, Trade.strike,
+        Trade.entry_price, Trade.exit_price, Trade.quantity, Trade.entry_time
+    ).where(Trade.status == 'OPEN'))).all()
+    
+    if not rows:
+        return FastJSONResponse([])
+    
+    # Current price is the last marked exit_price (falls back to entry for unmarked positions)
+    entry = np.array([r.entry_price for r in rows], dtype=np.float64)
+    current = np.array([r.exit_price or r.entry_price for r in rows], dtype=np.float64)
+    quantity = np.array([r.quantity for r in rows], dtype=np.float64)
+    
+    change = current - entry
+    pnl = np.round(change * quantity * 100, 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pnl_percent = np.round(np.where(entry != 0, change / entry * 100, 0.0), 2)
+    
+    positions = [
+        {
+            "id": str(r.id),
+            "symbol": r.ticker,
+            "option_type": r.option_type,
+            "strike": r.strike,
+            "entry_price": r.entry_price,
+            "current_price": current_price,
+            "quantity": r.quantity,
+            "pnl": position_pnl,
+            "pnl_percent": position_pnl_percent,
+            "entry_time": r.entry_time.isoformat() if r.entry_time else ""
+        }
+        for r, current_price, position_pnl, position_pnl_percent
+        in zip(rows, current.tolist(), pnl.tolist(), pnl_percent.tolist())
+    ]
+    
+    return FastJSONResponse(positions)
 
 
 @app.post("/api/positions/{position_id}/close", tags=["Positions"])
-async def close_position(position_id: int):
+async def close_position(position_id: int, session: AsyncSession = Depends(get_db_session)):
     """Close a position"""
-    session = get_session()
-    try:
-        trade = session.query(Trade).get(position_id)
-        if not trade:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Position not found"
-            )
-        
-        if trade.status != 'OPEN':
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Position is not open"
-            )
-        
-        # Use entry price + 1% for demo (in production, fetch real price)
-        exit_price = trade.entry_price * 1.01
-        
-        trade.exit_price = exit_price
-        trade.exit_time = datetime.utcnow()
-        trade.status = 'CLOSED'
-        trade.pnl = (exit_price - trade.entry_price) * trade.quantity * 100
-        
-        session.commit()
-        
-        logger.info(f"Closed position {position_id} with P&L: ${trade.pnl:.2f}")
-        
-        return {
-            "id": str(trade.id),
-            "status": trade.status,
-            "pnl": round(trade.pnl, 2)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error closing position: {e}")
-        session.rollback()
+    trade = await session.get(Trade, position_id)
+    if not trade:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Position not found"
         )
-    finally:
-        session.close()
+    
+    if trade.status != 'OPEN':
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Position is not open"
+        )
+    
+    # Use entry price + 1% for demo (in production, fetch real price)
+    exit_price = trade.entry_price * 1.01
+    
+    trade.exit_price = exit_price
+    trade.exit_time = datetime.utcnow()
+    trade.status = 'CLOSED'
+    trade.pnl = round((exit_price - trade.entry_price) * trade.quantity * 100, 2)
+    
+    await session.commit()
+    
+    invalidate_response_cache()
+    logger.info(f"Closed position {position_id} with P&L: ${trade.pnl:.2f}")
+    
+    return {
+        "id": str(trade.id),
+        "status": trade.status,
+        "pnl": trade.pnl
+    }
 
 
 # ==================== TRADES ====================
 
-@app.get("/api/trades", tags=["Trades"], response_model=List[TradeResponse])
-async def get_trades(filter: str = "all"):
-    """Get trades with optional filter (all, open, closed)"""
-    session = get_session()
-    try:
-        query = session.query(Trade)
-        
-        if filter == 'open':
-            query = query.filter_by(status='OPEN')
-        elif filter == 'closed':
-            query = query.filter_by(status='CLOSED')
-        
-        trades = query.order_by(Trade.entry_time.desc()).limit(100).all()
-        
-        result = []
-        for t in trades:
-            result.append(TradeResponse(
-                id=str(t.id),
-                symbol=t.ticker,
-                option_type=t.option_type,
-                strike=t.strike,
-                action='BUY' if t.status == 'OPEN' or not t.exit_price else 'SELL',
-                price=t.entry_price if t.status == 'OPEN' else t.exit_price,
-                quantity=t.quantity,
-                status=t.status,
-                pnl=round(t.pnl, 2) if t.pnl else None,
-                timestamp=t.entry_time.isoformat() if t.entry_time else ""
-            ))
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error getting trades: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-    finally:
-        session.close()
+# Response headers carrying the keyset cursor for the next page of /api/trades
+NEXT_BEFORE_HEADER = "X-Next-Before"
+NEXT_BEFORE_ID_HEADER = "X-Next-Before-Id"
+
+
+@app.get("/api/trades", tags=["Trades"], responses={200: {"model": List[TradeResponse]}})
+async def get_trades(
+    filter: str = "all",
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of trades to return"),
+    before: Optional[str] = Query(None, description="Return trades entered before this ISO timestamp"),
+    before_id: Optional[int] = Query(None, description="Tie-breaker id of the last trade on the previous page"),
+    session: AsyncSession = Depends(get_db_session)
+):
+    """Get trades with optional filter (all, open, closed), newest first with keyset pagination
+
+    A full page carries the cursor of its last trade in the X-Next-Before and
+    X-Next-Before-Id headers; pass them back as before/before_id for the next page.
+    """
+    query = select(
+        Trade.id, Trade.ticker, Trade.option_type, Trade.strike, Trade.status,
+        Trade.entry_price, Trade.exit_price, Trade.quantity, Trade.pnl, Trade.entry_time
+    )
+    
+    if filter == 'open':
+        query = query.where(Trade.status == 'OPEN')
+    elif filter == 'closed':
+        query = query.where(Trade.status == 'CLOSED')
+    
+    # Keyset pagination on (entry_time, id) so deep pages stay an index range scan
+    if before:
+        try:
+            before_time = datetime.fromisoformat(before)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid 'before' timestamp"
+            )
+        if before_id is not None:
+            query = query.where(tuple_(Trade.entry_time, Trade.id) < (before_time, before_id))
+        else:
+            query = query.where(Trade.entry_time < before_time)
+    
+    query = query.order_by(Trade.entry_time.desc(), Trade.id.desc()).limit(limit)
+    # Plain rows, not ORM instances: no identity map or attribute instrumentation
+    trades = (await session.execute(query)).all()
+    
+    result = [
+        {
+            "id": str(t.id),
+            "symbol": t.ticker,
+            "option_type": t.option_type,
+            "strike": t.strike,
+            "action": 'BUY' if t.status == 'OPEN' or not t.exit_price else 'SELL',
+            "price": t.entry_price if t.status == 'OPEN' else t.exit_price,
+            "quantity": t.quantity,
+            "status": t.status,
+            "pnl": t.pnl if t.pnl else None,
+            "timestamp": t.entry_time.isoformat() if t.entry_time else ""
+        }
+        for t in trades
+    ]
+    
+    headers = {}
+    if len(trades) == limit and trades[-1].entry_time:
+        headers[NEXT_BEFORE_HEADER] = trades[-1].entry_time.isoformat()
+        headers[NEXT_BEFORE_ID_HEADER] = str(trades[-1].id)
+    
+    return FastJSONResponse(result, headers=headers)
 
 
 # ==================== STATISTICS ====================
 
 @app.get("/api/stats", tags=["Statistics"], response_model=StatsResponse)
-async def get_stats():
+async def get_stats(session: AsyncSession = Depends(get_db_session)):
     """Get trading statistics"""
-    session = get_session()
-    try:
-        all_trades = session.query(Trade).all()
-        today = datetime.now().date()
-        
-        # Calculate stats
-        total_trades = len(all_trades)
-        open_positions = len([t for t in all_trades if t.status == 'OPEN'])
-        
-        # P&L calculations
-        total_pnl = sum(t.pnl for t in all_trades if t.pnl)
-        today_trades = [t for t in all_trades if t.entry_time and t.entry_time.date() == today]
-        today_pnl = sum(t.pnl for t in today_trades if t.pnl)
-        
-        # Win rate
-        closed_trades = [t for t in all_trades if t.status == 'CLOSED' and t.pnl is not None]
-        winning_trades = len([t for t in closed_trades if t.pnl > 0])
-        win_rate = (winning_trades / len(closed_trades) * 100) if closed_trades else 0
-        
-        return StatsResponse(
-            today_pnl=round(today_pnl, 2),
-            total_pnl=round(total_pnl, 2),
-            win_rate=round(win_rate, 1),
-            total_trades=total_trades,
-            open_positions=open_positions
-        )
-        
-    except Exception as e:
-        logger.error(f"Error getting stats: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-    finally:
-        session.close()
+    cached = get_cached_response("stats")
+    if cached is not None:
+        return cached
+    
+    summary = await get_trade_summary(session)
+    
+    # Win rate
+    closed_trades = summary["closed_trades"]
+    win_rate = (summary["winning_trades"] / closed_trades * 100) if closed_trades else 0
+    
+    return set_cached_response("stats", StatsResponse(
+        today_pnl=round(summary["today_pnl"], 2),
+        total_pnl=round(summary["total_pnl"], 2),
+        win_rate=round(win_rate, 1),
+        total_trades=summary["total_trades"],
+        open_positions=summary["open_positions"]
+    ))
 
 
 # For development
 if __name__ == '__main__':
     import uvicorn
-    uvicorn.run(app, host='0.0.0.0', port=PORT)
+    # Workers need an import string; with no bot attached, per-process state is only caches
+    uvicorn.run(
+        'api.app:app',
+        host='0.0.0.0',
+        port=PORT,
+        workers=API_WORKERS,
+        loop='auto',
+        http='httptools',
+        access_log=False
+    )
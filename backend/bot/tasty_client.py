@@ -3,19 +3,172 @@ TastyTrade API Client - Direct API with WebSocket Streaming
 Handles OAuth authentication and DXLink WebSocket streaming for live market data
 """
 import logging
+import re
+from bisect import bisect_left, bisect_right
 import httpx
 import asyncio
 import websockets
-import json
 import ssl
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Set
-from decimal import Decimal
+from datetime import date
+from collections import OrderedDict
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import List, Dict, NamedTuple, Optional, Set
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# OCC option symbol: root, YYMMDD, C/P, strike * 1000 as 8 digits
+_OCC_RE = re.compile(r'^(\S+)\s+(\d{6})([CP])(\d{8})$')
+
+
+# DXLink markers for a missing price
+_NAN_MARKERS = frozenset({'NaN', 'nan', '', None})
+
+
+# (monotonic time of the last check, date then); date.today() re-reads the clock and
+# builds a date on every chain-cache lookup, but the answer changes once a day
+_today_cache = (0.0, None)
+
+
+def _today() -> date:
+    """Local date, re-read from the clock at most once a minute"""
+    global _today_cache
+    now = time.monotonic()
+    checked_at, today = _today_cache
+    if today is None or now - checked_at > 60:
+        today = date.today()
+        _today_cache = (now, today)
+    return today
+
+
+def _parse_price(value) -> float:
+    """DXLink price field as a float; NaN/missing prices are 0"""
+    return 0.0 if value in _NAN_MARKERS else float(value)
+
+
+@lru_cache(maxsize=8192)
+def _occ_to_streamer_cached(occ_symbol: str) -> str:
+    """OCC -> streamer symbol ("SPY   251031C00370000" -> ".SPY251031C370"), or the input if not OCC"""
+    match = _OCC_RE.match(occ_symbol)
+    if match is None:
+        return occ_symbol
+    
+    ticker, date_part, option_type, strike_raw = match.groups()
+    # Integer math avoids float round-off in fractional strikes (00002500 -> 2.5)
+    whole, frac = divmod(int(strike_raw), 1000)
+    strike = f"{whole}" if frac == 0 else f"{whole}.{frac:03d}".rstrip('0')
+    return f".{ticker}{date_part}{option_type}{strike}"
+
+
+class _FieldMap:
+    """Copy a fixed set of response fields into a dict under new keys"""
+    
+    def __init__(self, *fields):
+        self.fields = fields  # (output key, response key, default if missing)
+        self.out_keys = tuple(out for out, _, _ in fields)
+        self.getter = itemgetter(*(src for _, src, _ in fields))
+    
+    def __call__(self, item: dict) -> dict:
+        try:
+            # Common case: every field present, one C-level itemgetter call
+            return dict(zip(self.out_keys, self.getter(item)))
+        except KeyError:
+            return {out: item.get(src, default) for out, src, default in self.fields}
+
+
+_POSITION_FIELDS = _FieldMap(
+    ('symbol', 'symbol', None),
+    ('quantity', 'quantity', None),
+    ('average_price', 'average-open-price', None),
+    ('current_price', 'mark-price', None),
+    ('pnl', 'realized-day-gain-loss', 0),
+)
+
+_BALANCE_FIELDS = _FieldMap(
+    ('cash', 'cash-balance', 0),
+    ('buying_power', 'derivative-buying-power', 0),
+    ('equity', 'net-liquidating-value', 0),
+    ('pnl_today', 'realized-day-gain-loss', 0),
+)
+
+
+# place_order arguments -> API values
+_ORDER_ACTIONS = {'BUY': 'Buy to Open', 'SELL': 'Sell to Close'}
+_ORDER_TYPES = {'MARKET': 'Market', 'LIMIT': 'Limit'}
+
+
+class OptionContract(NamedTuple):
+    """A single option from a parsed chain"""
+    symbol: str
+    streamer_symbol: Optional[str]
+    option_type: str  # 'C' or 'P'
+    strike_price: float
+    expiration_date: date
+    dte: int
+
+
+class OptionChain(dict):
+    """
+    Option chain as dict[expiration date, list[option]], plus per (expiration, type)
+    strike arrays sorted ascending so ATM lookups are a binary search,
+    expirations sorted by DTE so a DTE window is a slice, and a symbol index
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.strikes = {}  # (exp_date, 'C'/'P') -> (sorted float64 strikes, options in the same order)
+        self.expirations = []  # expiration dates, ascending
+        self.dtes = []  # days to expiration of each entry in expirations (as of indexing)
+        self.by_symbol = {}  # OCC and streamer symbol -> option
+        self.subscribed_windows = set()  # (dte_min, dte_max) windows already streaming
+    
+    def index_strikes(self, today: date):
+        """Build the sorted strike arrays and the DTE index from the chain's options"""
+        self.expirations = sorted(self)
+        self.dtes = [(exp_date - today).days for exp_date in self.expirations]
+        self.strikes = {}
+        self.by_symbol = {}
+        for exp_date, options in self.items():
+            for opt in options:
+                self.by_symbol[opt.symbol] = opt
+                if opt.streamer_symbol:
+                    self.by_symbol[opt.streamer_symbol] = opt
+            for option_type in ('C', 'P'):
+                typed = sorted(
+                    (opt for opt in options if opt.option_type == option_type),
+                    key=lambda opt: opt.strike_price
+                )
+                if typed:
+                    strikes = np.array([opt.strike_price for opt in typed], dtype=np.float64)
+                    self.strikes[(exp_date, option_type)] = (strikes, typed)
+    
+    def expirations_between(self, dte_min: int, dte_max: int) -> List[date]:
+        """Expirations with dte_min <= DTE <= dte_max, ascending"""
+        return self.expirations[bisect_left(self.dtes, dte_min):bisect_right(self.dtes, dte_max)]
+    
+    def nearest(self, exp_date, option_type: str, price: float):
+        """
+        Option of the given expiration and type whose strike is closest to price
+        
+        Returns:
+            (distance, option) or None if there is no such option
+        """
+        entry = self.strikes.get((exp_date, option_type))
+        if entry is None:
+            return None
+        
+        strikes, options = entry
+        idx = int(np.searchsorted(strikes, price))
+        # Prefer the lower strike on a tie, like a min() scan over ascending strikes
+        if idx == len(strikes) or (idx > 0 and price - strikes[idx - 1] <= strikes[idx] - price):
+            idx -= 1
+        return abs(strikes[idx] - price), options[idx]
+
 
 class TastyClient:
     """Direct API client for TastyTrade with WebSocket streaming for market data"""
@@ -24,7 +177,53 @@ class TastyClient:
     CERT_BASE_URL = "https://api.cert.tastyworks.com"  # Paper trading
     PROD_BASE_URL = "https://api.tastyworks.com"  # Live trading
     
-    def __init__(self, client_secret: str, refresh_token: str, account_number: str, paper_trading: bool = True):
+    # Retry policy: connection attempts at the transport level; rate-limit and
+    # transient server errors for idempotent GETs only (orders are never retried)
+    CONNECT_RETRIES = 3
+    GET_RETRIES = 3
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+    RETRY_BACKOFF = 0.5  # seconds, doubled per attempt
+    RETRY_MAX_DELAY = 10.0
+    
+    # Refresh the access token this many seconds before it expires: the background
+    # refresher acts first, the inline check in _ensure_authenticated is the fallback
+    TOKEN_REFRESH_SKEW = 600
+    TOKEN_BACKGROUND_REFRESH_SKEW = 900
+    TOKEN_REFRESH_RETRY = 30  # seconds between background attempts after a failure
+    
+    # Seconds a fetched option chain is reused (the strike universe barely moves intraday)
+    CHAIN_CACHE_TTL = 300
+    # Most symbols whose chains are kept (parsed chains are large)
+    CHAIN_CACHE_MAX_SYMBOLS = 64
+    
+    # Seconds positions/balance are reused so back-to-back polls cost one request
+    ACCOUNT_CACHE_TTL = 1.0
+    
+    # Seconds to wait for each DXLink handshake reply, and for the whole connection
+    HANDSHAKE_TIMEOUT = 10.0
+    WS_CONNECT_TIMEOUT = 10.0
+    # KEEPALIVE is constant, so it is serialized once (sent as a text frame)
+    KEEPALIVE_FRAME = orjson.dumps({"type": "KEEPALIVE", "channel": 0}).decode()
+    # Max symbols per FEED_SUBSCRIPTION frame
+    SUBSCRIPTION_BATCH_SIZE = 100
+    
+    # Fixed parts of every order payload, built once per class; place_order copies them
+    # and fills in the rest (dry-run: paper trading simulation)
+    ORDER_TEMPLATE = {"time-in-force": "Day", "dry-run": True}
+    LEG_TEMPLATE = {"instrument-type": "Equity Option"}
+    
+    # Worker threads behind the async wrappers of blocking calls (place_order_async, ...)
+    EXECUTOR_WORKERS = 8
+    
+    # Initial quote slots (streamer symbols); the arrays double when full
+    QUOTE_CAPACITY = 1024
+    # Seconds after a read during which a symbol's quotes are decoded as they arrive
+    HOT_QUOTE_TTL = 5.0
+    # Max seconds get_quotes_bulk waits for the first quotes of new symbols
+    QUOTE_WAIT_TIMEOUT = 1.5
+    
+    def __init__(self, client_secret: str, refresh_token: str, account_number: str, paper_trading: bool = True,
+                 session_token: Optional[str] = None, token_expires_at: Optional[float] = None):
         """
         Initialize TastyTrade API client with WebSocket streaming
         
@@ -33,6 +232,8 @@ class TastyClient:
             refresh_token: OAuth refresh token
             account_number: Account number
             paper_trading: Use paper trading environment if True
+            session_token: Previously issued access token to reuse
+            token_expires_at: Absolute UNIX time at which session_token expires
         """
         self.client_secret = client_secret
         self.refresh_token = refresh_token
@@ -42,52 +243,196 @@ class TastyClient:
         # API endpoints
         self.base_url = self.CERT_BASE_URL if paper_trading else self.PROD_BASE_URL
         
-        # Session management
-        self.session_token = None
+        # Session management (token_expires_at is absolute UNIX seconds, safe to persist;
+        # expiry checks use the monotonic _token_deadline so wall-clock jumps can't fool them)
+        self.session_token = session_token
         self.token_expires_at = None
+        self._token_deadline = 0.0
+        self._set_token_expiry(token_expires_at)
+        # Serializes token refreshes across the REST, WebSocket and refresher threads
+        self._auth_lock = threading.Lock()
+        self._token_refresher = None
+        self._closing = threading.Event()
+        
+        # HTTP client: one pooled HTTP/2 connection set reused for every REST call
+        self.client = httpx.Client(**self._http_client_options())
         
-        # HTTP client
-        self.client = httpx.Client(timeout=30.0)
+        # Async HTTP client for concurrent REST calls; lives on its own background loop
+        self.async_client = None
+        self.rest_loop = None
+        self._async_auth_lock = None
         
         # WebSocket streaming
         self.ws = None
         self.dxlink_url = None
         self.dxlink_token = None
         self.ws_channel = 1  # Channel for market data
-        self.quote_cache = {}  # Cache latest quotes
+        # Latest quotes as parallel arrays (bid/ask/last and the update times of the
+        # quote and trade fields) indexed by slot, with a streamer symbol -> slot map;
+        # slots are only added by the WebSocket thread
+        self._sym2idx: Dict[str, int] = {}
+        self._bid = np.zeros(self.QUOTE_CAPACITY)
+        self._ask = np.zeros(self.QUOTE_CAPACITY)
+        self._last = np.zeros(self.QUOTE_CAPACITY)
+        self._quote_ts = np.zeros(self.QUOTE_CAPACITY)
+        self._trade_ts = np.zeros(self.QUOTE_CAPACITY)
         self.subscribed_symbols = set()  # Track subscribed symbols
+        self.quote_ready: Dict[str, threading.Event] = {}  # Set when a symbol's first quote lands
+        # Demand-driven decoding: symbol -> time until which its records are decoded eagerly,
+        # and the latest undecoded (raw) Quote/Trade fields of every other symbol
+        self._hot_symbols: Dict[str, float] = {}
+        self._raw_quotes: Dict[str, tuple] = {}
+        self._raw_trades: Dict[str, tuple] = {}
         self.ws_task = None
         self.ws_loop = None
+        self.ws_ready = threading.Event()  # Set once the DXLink handshake completes
+        # Built once (loading the CA bundle is not free) and reused on every reconnect;
+        # DXLink serves publicly trusted certificates, so verification stays on
+        self._ssl_context = ssl.create_default_context()
         self.keepalive_task = None
+        self._subscription_queue = None  # asyncio.Queue of symbol lists, one per WebSocket connection
+        self._subscription_task = None
+        
+        # Option chains by (symbol, date): (fetched_at monotonic, ETag, chain)
+        self._chain_cache = OrderedDict()  # oldest fetch first
+        self._chain_cache_lock = threading.Lock()  # serializes stores/evictions
+        self._chain_locks: Dict[str, threading.Lock] = {}  # symbol -> lock held while fetching
         
         # Account info
         self.account = None
+        self._account_validated = False
+        # 'positions'/'balance' -> (fetched_at monotonic, value), see ACCOUNT_CACHE_TTL
+        self._account_cache = {}
         
-    def __del__(self):
-        """Clean up resources"""
-        try:
-            if self.ws:
-                asyncio.run(self._close_websocket())
+        # Worker threads for the *_async wrappers around blocking calls (created on first use)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
+    def _http_client_options(self, transport_class=httpx.HTTPTransport) -> dict:
+        """Connection settings shared by the sync and async HTTP clients"""
+        # http2/limits must be set on the transport: the client ignores them when one is given.
+        # retries only repeats failed connection attempts, so it is safe for POSTs too.
+        # Idle connections are kept for 5 minutes so they survive the gap between trading cycles.
+        # Connects and pool waits fail fast on a dead peer; reads keep room for large chains.
+        transport = transport_class(
+            http2=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=300.0),
+            retries=self.CONNECT_RETRIES
+        )
+        return {
+            'base_url': self.base_url,
+            'transport': transport,
+            'timeout': httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+            'headers': self._default_headers()
+        }
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a GET, or None if the response is final"""
+        if response.status_code not in self.RETRY_STATUSES or attempt >= self.GET_RETRIES:
+            return None
+        
+        retry_after = response.headers.get('Retry-After', '')
+        delay = float(retry_after) if retry_after.isdigit() else self.RETRY_BACKOFF * 2 ** attempt
+        logger.warning(f"{response.request.url.path} returned {response.status_code}, retrying in {delay:.1f}s")
+        return min(delay, self.RETRY_MAX_DELAY)
+    
+    def _get(self, url: str, headers: Optional[dict] = None) -> httpx.Response:
+        """GET with retries on rate limiting and transient server errors"""
+        attempt = 0
+        while True:
+            response = self.client.get(url, headers=headers)
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                return response
+            time.sleep(delay)
+            attempt += 1
+    
+    def close(self):
+        """Close the WebSocket stream and both HTTP clients"""
+        self._closing.set()
+        
+        if self.ws and self.ws_loop and self.ws_loop.is_running():
+            try:
+                # The socket belongs to the WebSocket loop, so close it there
+                asyncio.run_coroutine_threadsafe(self._close_websocket(), self.ws_loop).result(timeout=5)
+            except Exception as e:
+                logger.warning(f"Error closing WebSocket: {e}")
+        
+        if self.rest_loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self.async_client.aclose(), self.rest_loop).result(timeout=5)
+            except Exception as e:
+                logger.warning(f"Error closing async HTTP client: {e}")
+            self.rest_loop.call_soon_threadsafe(self.rest_loop.stop)
+            self.rest_loop = None
+            self.async_client = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        
+        if getattr(self, 'client', None) is not None:
             self.client.close()
-        except:
-            pass
     
-    def _get_headers(self, include_auth: bool = True) -> dict:
-        """Get headers for API requests"""
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        if include_auth and self.session_token:
+    def reconnect(self):
+        """Replace the HTTP connection pools in place, keeping this object (and its caches) shared"""
+        self._reopen()
+        self._start_token_refresher()
+        
+        old_client = self.client
+        self.client = httpx.Client(**self._http_client_options())
+        old_client.close()
+        
+        if self.rest_loop is not None:
+            async def swap_async_client():
+                old_async_client = self.async_client
+                self.async_client = httpx.AsyncClient(**self._http_client_options(httpx.AsyncHTTPTransport))
+                await old_async_client.aclose()
+            
+            asyncio.run_coroutine_threadsafe(swap_async_client(), self.rest_loop).result()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        # close() blocks on the client's own loops, so keep it off the caller's loop
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+    
+    def __del__(self):
+        """Safety net only; call close() (or use the client as a context manager)"""
+        client = getattr(self, 'client', None)
+        if client is not None and not client.is_closed:
+            client.close()
+    
+    def _default_headers(self) -> dict:
+        """Headers sent with every REST request, including the current bearer token"""
+        headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        if self.session_token:
             headers["Authorization"] = f"Bearer {self.session_token}"
         return headers
     
+    def _set_auth_header(self):
+        """Install the current bearer token on the HTTP clients after it rotates"""
+        authorization = f"Bearer {self.session_token}"
+        self.client.headers["Authorization"] = authorization
+        if self.async_client is not None:
+            self.async_client.headers["Authorization"] = authorization
+    
+    def _set_token_expiry(self, expires_at: Optional[float]):
+        """Record the token's absolute expiry and the matching monotonic deadline"""
+        self.token_expires_at = expires_at
+        self._token_deadline = time.monotonic() + (expires_at - time.time()) if expires_at else 0.0
+    
     def _is_token_expired(self) -> bool:
         """Check if current token is expired or about to expire"""
-        if not self.token_expires_at:
-            return True
         # Refresh if token expires in less than 10 minutes
-        return datetime.now() >= self.token_expires_at - timedelta(minutes=10)
+        return time.monotonic() >= self._token_deadline - self.TOKEN_REFRESH_SKEW
     
     def _get_access_token(self) -> bool:
         """
@@ -97,7 +442,7 @@ class TastyClient:
             True if token obtained successfully
         """
         try:
-            url = f"{self.base_url}/oauth/token"
+            url = "/oauth/token"
             
             payload = {
                 "grant_type": "refresh_token",
@@ -105,28 +450,28 @@ class TastyClient:
                 "client_secret": self.client_secret
             }
             
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
             logger.info(f"Getting OAuth token from TastyTrade {'Certification (Paper)' if self.paper_trading else 'Production'} environment...")
             
-            response = self.client.post(url, json=payload, headers=headers)
+            # The token endpoint authenticates with the refresh token, not a bearer
+            request = self.client.build_request("POST", url, json=payload)
+            request.headers.pop("Authorization", None)
+            response = self.client.send(request)
             
             if response.status_code != 200:
                 logger.error(f"OAuth token request failed: {response.status_code} - {response.text}")
                 return False
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
             if 'access_token' in data:
                 self.session_token = data.get('access_token')
+                self._set_auth_header()
                 expires_in = data.get('expires_in', 86400)  # Default 24 hours
                 
-                self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                self._set_token_expiry(time.time() + int(expires_in))
                 
-                logger.info("Successfully obtained OAuth access token")
+                # http_version shows whether the pool negotiated HTTP/2 with the API
+                logger.info(f"Successfully obtained OAuth access token over {response.http_version}")
                 return True
             else:
                 logger.error(f"Invalid OAuth response format: {data}")
@@ -146,8 +491,46 @@ class TastyClient:
         if self.session_token and not self._is_token_expired():
             return True
         
-        logger.info("Session token missing or expired, obtaining new token...")
-        return self._get_access_token()
+        with self._auth_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self.session_token and not self._is_token_expired():
+                return True
+            logger.info("Session token missing or expired, obtaining new token...")
+            return self._get_access_token()
+    
+    def _reopen(self):
+        """Undo close() so the token refresher can run again"""
+        if self._closing.is_set():
+            if self._token_refresher is not None:
+                # close() wakes the refresher so it exits promptly; wait for it so a
+                # thread on its way out is not mistaken for a running one
+                self._token_refresher.join(timeout=5)
+            self._closing.clear()
+    
+    def _start_token_refresher(self):
+        """Start the background token refresher thread (once)"""
+        if self._token_refresher is None or not self._token_refresher.is_alive():
+            self._token_refresher = threading.Thread(
+                target=self._token_refresh_loop, name="tasty-token-refresh", daemon=True
+            )
+            self._token_refresher.start()
+    
+    def _token_refresh_loop(self):
+        """Refresh the access token ahead of expiry so request paths never wait on it"""
+        while not self._closing.is_set():
+            delay = self._token_deadline - self.TOKEN_BACKGROUND_REFRESH_SKEW - time.monotonic()
+            if delay > 0:
+                # Re-check periodically in case an inline refresh moved the expiry
+                self._closing.wait(min(delay, 300))
+                continue
+            
+            with self._auth_lock:
+                if time.monotonic() < self._token_deadline - self.TOKEN_BACKGROUND_REFRESH_SKEW:
+                    continue
+                refreshed = self._get_access_token()
+            if not refreshed:
+                logger.warning(f"Background token refresh failed, retrying in {self.TOKEN_REFRESH_RETRY}s")
+                self._closing.wait(self.TOKEN_REFRESH_RETRY)
     
     def _get_dxlink_token(self) -> bool:
         """
@@ -160,14 +543,14 @@ class TastyClient:
             if not self._ensure_authenticated():
                 return False
             
-            url = f"{self.base_url}/api-quote-tokens"
-            response = self.client.get(url, headers=self._get_headers())
+            url = "/api-quote-tokens"
+            response = self._get(url)
             
             if response.status_code != 200:
                 logger.error(f"Failed to get DXLink token: {response.status_code} - {response.text}")
                 return False
             
-            data = response.json()
+            data = orjson.loads(response.content)
             token_data = data.get('data', {})
             
             self.dxlink_token = token_data.get('token')
@@ -186,18 +569,22 @@ class TastyClient:
     
     async def _websocket_handler(self):
         """Main WebSocket handler loop"""
+        # Fresh queue per connection, bound to this loop; requests made during the
+        # handshake wait in it for the writer
+        subscription_queue = self._subscription_queue = asyncio.Queue()
         try:
             logger.info(f"Connecting to DXLink WebSocket: {self.dxlink_url}")
             
-            # Configure SSL context to handle certificate verification
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            async with websockets.connect(self.dxlink_url, ssl=ssl_context) as websocket:
+            # DXLink's own KEEPALIVE messages keep the connection alive; disable the
+            # library's protocol-level pings so there is only one timer and one send
+            async with websockets.connect(
+                self.dxlink_url, ssl=self._ssl_context, ping_interval=None, ping_timeout=None
+            ) as websocket:
                 self.ws = websocket
                 
-                # Step 1: SETUP
+                # Handshake messages are pipelined: DXLink processes them in order, so
+                # SETUP, AUTH, CHANNEL_REQUEST and FEED_SETUP go out back to back and the
+                # replies are drained afterwards (one round trip instead of four)
                 setup_msg = {
                     "type": "SETUP",
                     "channel": 0,
@@ -205,41 +592,17 @@ class TastyClient:
                     "keepaliveTimeout": 60,
                     "acceptKeepaliveTimeout": 60
                 }
-                await websocket.send(json.dumps(setup_msg))
-                logger.debug(f"Sent SETUP: {setup_msg}")
-                
-                response = await websocket.recv()
-                logger.debug(f"Received: {response}")
-                
-                # Step 2: Wait for AUTH_STATE and AUTHORIZE
-                response = await websocket.recv()
-                logger.debug(f"Received: {response}")
-                
                 auth_msg = {
                     "type": "AUTH",
                     "channel": 0,
                     "token": self.dxlink_token
                 }
-                await websocket.send(json.dumps(auth_msg))
-                logger.debug(f"Sent AUTH")
-                
-                response = await websocket.recv()
-                logger.debug(f"Received: {response}")
-                
-                # Step 3: CHANNEL_REQUEST
                 channel_msg = {
                     "type": "CHANNEL_REQUEST",
                     "channel": self.ws_channel,
                     "service": "FEED",
                     "parameters": {"contract": "AUTO"}
                 }
-                await websocket.send(json.dumps(channel_msg))
-                logger.debug(f"Sent CHANNEL_REQUEST")
-                
-                response = await websocket.recv()
-                logger.debug(f"Received: {response}")
-                
-                # Step 4: FEED_SETUP
                 feed_setup_msg = {
                     "type": "FEED_SETUP",
                     "channel": self.ws_channel,
@@ -250,21 +613,29 @@ class TastyClient:
                         "Trade": ["eventType", "eventSymbol", "price", "size", "dayVolume"]
                     }
                 }
-                await websocket.send(json.dumps(feed_setup_msg))
-                logger.debug(f"Sent FEED_SETUP")
+                for msg in (setup_msg, auth_msg, channel_msg, feed_setup_msg):
+                    await websocket.send(orjson.dumps(msg).decode())
+                logger.debug("Sent SETUP, AUTH, CHANNEL_REQUEST and FEED_SETUP")
                 
-                response = await websocket.recv()
-                logger.debug(f"Received: {response}")
+                if not await self._read_handshake(websocket, {"AUTH_STATE", "CHANNEL_OPENED", "FEED_CONFIG"}):
+                    # Rejected while still unauthorized: open the channel step by step
+                    logger.warning("Pipelined DXLink handshake rejected, retrying channel setup serially")
+                    for msg, reply in ((channel_msg, "CHANNEL_OPENED"), (feed_setup_msg, "FEED_CONFIG")):
+                        await websocket.send(orjson.dumps(msg).decode())
+                        if not await self._read_handshake(websocket, {reply}):
+                            raise ConnectionError(f"DXLink rejected {msg['type']}")
                 
                 logger.info("✓ WebSocket connection established and configured")
+                self.ws_ready.set()
                 
-                # Start keepalive task
+                # Start keepalive and subscription writer tasks
                 self.keepalive_task = asyncio.create_task(self._keepalive_loop(websocket))
+                self._subscription_task = asyncio.create_task(self._subscription_writer(subscription_queue))
                 
                 # Listen for messages
                 async for message in websocket:
                     try:
-                        data = json.loads(message)
+                        data = orjson.loads(message)
                         await self._handle_message(data)
                     except Exception as e:
                         logger.error(f"Error handling message: {e}")
@@ -275,16 +646,40 @@ class TastyClient:
             logger.error(f"WebSocket error: {e}", exc_info=True)
         finally:
             self.ws = None
+            self.ws_ready.clear()
+            if self._subscription_queue is subscription_queue:
+                self._subscription_queue = None
             if self.keepalive_task:
                 self.keepalive_task.cancel()
+            if self._subscription_task:
+                self._subscription_task.cancel()
+    
+    async def _read_handshake(self, websocket, expected: Set[str]) -> bool:
+        """
+        Read handshake replies until every expected message type has arrived
+        
+        AUTH_STATE only counts once it reports AUTHORIZED. Returns False if DXLink
+        answers with an ERROR.
+        """
+        pending = set(expected)
+        while pending:
+            message = orjson.loads(await asyncio.wait_for(websocket.recv(), self.HANDSHAKE_TIMEOUT))
+            logger.debug(f"Received: {message}")
+            msg_type = message.get('type')
+            if msg_type == 'ERROR':
+                logger.warning(f"DXLink error during handshake: {message}")
+                return False
+            if msg_type == 'AUTH_STATE' and message.get('state') != 'AUTHORIZED':
+                continue
+            pending.discard(msg_type)
+        return True
     
     async def _keepalive_loop(self, websocket):
         """Send keepalive messages every 30 seconds"""
         try:
             while True:
                 await asyncio.sleep(30)
-                keepalive_msg = {"type": "KEEPALIVE", "channel": 0}
-                await websocket.send(json.dumps(keepalive_msg))
+                await websocket.send(self.KEEPALIVE_FRAME)
                 logger.debug("Sent KEEPALIVE")
         except asyncio.CancelledError:
             pass
@@ -306,59 +701,113 @@ class TastyClient:
             # COMPACT format: ["Quote", [data...]]
             event_type = feed_data[0] if len(feed_data) > 0 else None
             events = feed_data[1] if len(feed_data) > 1 else []
+            # One timestamp and slot-map lookup per frame, not per record
+            now = time.time()
+            sym2idx = self._sym2idx
+            hot = self._hot_symbols
             
+            # Records for symbols nobody has read within HOT_QUOTE_TTL are kept as raw
+            # fields and only decoded by get_quotes_bulk if they are asked for
             if event_type == "Quote":
-                # Parse Quote events
+                # Parse Quote events; COMPACT blocks hold fixed-width records of one type,
+                # so walk them six fields at a time (a trailing partial record is dropped)
                 # Format: ["Quote", symbol, bidPrice, askPrice, bidSize, askSize, ...]
-                i = 0
-                while i < len(events):
-                    if events[i] == "Quote":
+                raw_quotes = self._raw_quotes
+                fields = iter(events)
+                for _, symbol, bid, ask, _, _ in zip(*[fields] * 6):
+                    idx = sym2idx.get(symbol)
+                    if idx is None:
+                        idx = self._intern_symbol(symbol)
+                    
+                    if hot.get(symbol, 0) < now:
+                        raw_quotes[symbol] = (bid, ask, now)
+                    else:
                         try:
-                            symbol = events[i + 1]
-                            bid_price = float(events[i + 2]) if events[i + 2] not in ['NaN', None] else 0
-                            ask_price = float(events[i + 3]) if events[i + 3] not in ['NaN', None] else 0
-                            
-                            # Update cache
-                            if symbol not in self.quote_cache:
-                                self.quote_cache[symbol] = {}
-                            
-                            self.quote_cache[symbol].update({
-                                'bid': bid_price,
-                                'ask': ask_price,
-                                'mark': (bid_price + ask_price) / 2 if (bid_price > 0 and ask_price > 0) else 0,
-                                'timestamp': time.time()
-                            })
-                            
-                            i += 6  # Move to next quote (Quote type + 5 fields)
-                        except (IndexError, ValueError) as e:
+                            bid_price = _parse_price(bid)
+                            ask_price = _parse_price(ask)
+                        except (TypeError, ValueError) as e:
                             logger.debug(f"Error parsing quote: {e}")
                             break
-                    else:
-                        i += 1
+                        
+                        # Update cache
+                        raw_quotes.pop(symbol, None)
+                        self._bid[idx] = bid_price
+                        self._ask[idx] = ask_price
+                        self._quote_ts[idx] = now
+                    self._signal_quote_ready(symbol)
             
             elif event_type == "Trade":
-                # Parse Trade events for last price
-                i = 0
-                while i < len(events):
-                    if events[i] == "Trade":
+                # Parse Trade events for last price, five fields per record
+                # Format: ["Trade", symbol, price, size, dayVolume, ...]
+                raw_trades = self._raw_trades
+                fields = iter(events)
+                for _, symbol, price, _, _ in zip(*[fields] * 5):
+                    idx = sym2idx.get(symbol)
+                    if idx is None:
+                        idx = self._intern_symbol(symbol)
+                    
+                    if hot.get(symbol, 0) < now:
+                        raw_trades[symbol] = (price, now)
+                    else:
                         try:
-                            symbol = events[i + 1]
-                            last_price = float(events[i + 2]) if events[i + 2] not in ['NaN', None] else 0
-                            
-                            if symbol not in self.quote_cache:
-                                self.quote_cache[symbol] = {}
-                            
-                            self.quote_cache[symbol].update({
-                                'last': last_price,
-                                'timestamp': time.time()
-                            })
-                            
-                            i += 5  # Move to next trade
-                        except (IndexError, ValueError) as e:
+                            last_price = _parse_price(price)
+                        except (TypeError, ValueError) as e:
                             logger.debug(f"Error parsing trade: {e}")
                             break
-                    else:
-                        i += 1
+                        
+                        raw_trades.pop(symbol, None)
+                        self._last[idx] = last_price
+                        self._trade_ts[idx] = now
+                    self._signal_quote_ready(symbol)
+    
+    def _decode_raw_quotes(self, streamer_symbols):
+        """
+        Decode quotes that arrived while their symbols were cold into the quote arrays
+
+        Runs on the caller's thread while the WebSocket loop may be writing the same
+        slots, so a raw record older than the slot's quote (or trade) timestamp is
+        dropped rather than overwriting a newer hot-path value.
+        """
+        sym2idx = self._sym2idx
+        for symbol in streamer_symbols:
+            raw_quote = self._raw_quotes.pop(symbol, None)
+            raw_trade = self._raw_trades.pop(symbol, None)
+            if raw_quote is None and raw_trade is None:
+                continue
+            
+            idx = sym2idx[symbol]
+            try:
+                if raw_quote is not None:
+                    bid, ask, ts = raw_quote
+                    if ts >= self._quote_ts[idx]:
+                        self._bid[idx] = _parse_price(bid)
+                        self._ask[idx] = _parse_price(ask)
+                        self._quote_ts[idx] = ts
+                if raw_trade is not None:
+                    price, ts = raw_trade
+                    if ts >= self._trade_ts[idx]:
+                        self._last[idx] = _parse_price(price)
+                        self._trade_ts[idx] = ts
+            except (TypeError, ValueError) as e:
+                logger.debug(f"Error parsing quote for {symbol}: {e}")
+    
+    def _intern_symbol(self, symbol: str) -> int:
+        """Allocate a quote slot for a new streamer symbol, doubling the arrays when full"""
+        idx = len(self._sym2idx)
+        if idx == len(self._bid):
+            # Grow before publishing the slot so readers never index past the arrays
+            self._bid, self._ask, self._last, self._quote_ts, self._trade_ts = (
+                np.concatenate((values, np.zeros(idx)))
+                for values in (self._bid, self._ask, self._last, self._quote_ts, self._trade_ts)
+            )
+        self._sym2idx[symbol] = idx
+        return idx
+    
+    def _signal_quote_ready(self, symbol: str):
+        """Wake callers waiting for the first quote of a symbol"""
+        ready = self.quote_ready.pop(symbol, None)
+        if ready is not None:
+            ready.set()
     
     async def _subscribe_symbols(self, symbols: List[str]):
         """Subscribe to symbols on WebSocket"""
@@ -384,7 +833,7 @@ class TastyClient:
                 "add": add_list
             }
             
-            await self.ws.send(json.dumps(sub_msg))
+            await self.ws.send(orjson.dumps(sub_msg).decode())
             logger.info(f"Subscribed to {len(symbols)} symbols")
             return True
             
@@ -392,6 +841,36 @@ class TastyClient:
             logger.error(f"Error subscribing to symbols: {e}")
             return False
     
+    def _queue_subscriptions(self, symbols: List[str]):
+        """Queue symbols for the subscription writer (runs on the WebSocket loop)"""
+        if self._subscription_queue is None:
+            logger.warning(f"WebSocket not running, dropped subscription of {len(symbols)} symbols")
+            return
+        self._subscription_queue.put_nowait(symbols)
+    
+    async def _subscription_writer(self, queue: asyncio.Queue):
+        """
+        Send queued subscriptions: block for the first request, then drain everything
+        else already queued into the same FEED_SUBSCRIPTION frame(s), so a burst of
+        requests (or requests arriving while a frame is being sent) costs one frame
+        """
+        batch = self.SUBSCRIPTION_BATCH_SIZE
+        try:
+            while True:
+                pending = dict.fromkeys(await queue.get())
+                while not queue.empty():
+                    pending.update(dict.fromkeys(queue.get_nowait()))
+                
+                try:
+                    pending = [s for s in pending if s not in self.subscribed_symbols]
+                    for i in range(0, len(pending), batch):
+                        await self._subscribe_symbols(pending[i:i + batch])
+                except Exception as e:
+                    # Keep serving later requests; these symbols can be requested again
+                    logger.error(f"Error sending queued subscriptions: {e}", exc_info=True)
+        except asyncio.CancelledError:
+            pass
+    
     async def _close_websocket(self):
         """Close WebSocket connection"""
         if self.ws:
@@ -403,24 +882,31 @@ class TastyClient:
         
         if self.keepalive_task:
             self.keepalive_task.cancel()
+        if self._subscription_task:
+            self._subscription_task.cancel()
     
     def _start_websocket_thread(self):
         """Start WebSocket in a separate thread with its own event loop"""
         def run_websocket():
-            self.ws_loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.ws_loop)
+            loop = self.ws_loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
             try:
-                self.ws_loop.run_until_complete(self._websocket_handler())
+                loop.run_until_complete(self._websocket_handler())
             except Exception as e:
                 logger.error(f"WebSocket thread error: {e}")
             finally:
-                self.ws_loop.close()
+                # Unpublish the loop before closing it so subscribers see the stream is down
+                if self.ws_loop is loop:
+                    self.ws_loop = None
+                loop.close()
         
+        self.ws_ready.clear()
         thread = threading.Thread(target=run_websocket, daemon=True)
         thread.start()
         
-        # Wait a bit for connection to establish
-        time.sleep(3)
+        # Return as soon as the handshake is done rather than after a fixed delay
+        if not self.ws_ready.wait(timeout=self.WS_CONNECT_TIMEOUT):
+            raise TimeoutError("WebSocket handshake timed out")
     
     def connect(self) -> bool:
         """
@@ -430,42 +916,29 @@ class TastyClient:
             True if connection successful
         """
         try:
+            # After close(), the shared client needs fresh connection pools first
+            if self.client.is_closed:
+                self.reconnect()
+            
             # Authenticate
             if not self._ensure_authenticated():
                 return False
+            self._reopen()
+            self._start_token_refresher()
             
             if self.paper_trading:
                 logger.info("Connected to TastyTrade Certification (Paper) environment")
             else:
                 logger.info("Connected to TastyTrade Production environment")
             
-            # Get accounts
-            url = f"{self.base_url}/customers/me/accounts"
-            response = self.client.get(url, headers=self._get_headers())
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to get accounts: {response.status_code} - {response.text}")
-                return False
-            
-            data = response.json()
-            accounts = data.get('data', {}).get('items', [])
-            
-            if not accounts:
-                logger.error("No accounts found")
-                return False
-            
-            # Find the specified account or use the first one
             if self.account_number:
-                self.account = next(
-                    (acc for acc in accounts if acc.get('account', {}).get('account-number') == self.account_number),
-                    None
-                )
-                if not self.account:
-                    logger.error(f"Account {self.account_number} not found")
-                    available = [acc.get('account', {}).get('account-number') for acc in accounts]
-                    logger.info(f"Available accounts: {available}")
-                    return False
+                # Known account: skip the account list round trip, validated lazily
+                # the first time an account endpoint answers 403/404
+                self.account = {'account': {'account-number': self.account_number}}
             else:
+                accounts = self._fetch_accounts()
+                if not accounts:
+                    return False
                 self.account = accounts[0]
                 self.account_number = self.account.get('account', {}).get('account-number')
                 logger.info(f"No account specified, using first account: {self.account_number}")
@@ -477,8 +950,9 @@ class TastyClient:
                 logger.error("Failed to get DXLink token")
                 return False
             
-            # Start WebSocket connection
-            self._start_websocket_thread()
+            # Start WebSocket connection (the shared client may already be streaming)
+            if self.ws is None:
+                self._start_websocket_thread()
             
             logger.info("✓ TastyTrade API and WebSocket streaming ready")
             return True
@@ -487,6 +961,40 @@ class TastyClient:
             logger.error(f"Connection error: {e}", exc_info=True)
             return False
     
+    def _fetch_accounts(self) -> Optional[List[Dict]]:
+        """Fetch the customer's accounts, or None if the request fails or returns none"""
+        url = "/customers/me/accounts"
+        response = self._get(url)
+        
+        if response.status_code != 200:
+            logger.error(f"Failed to get accounts: {response.status_code} - {response.text}")
+            return None
+        
+        accounts = orjson.loads(response.content).get('data', {}).get('items', [])
+        if not accounts:
+            logger.error("No accounts found")
+            return None
+        return accounts
+    
+    def _check_account_access(self, status_code: int):
+        """On a 403/404 from an account endpoint, verify the configured account exists"""
+        if status_code not in (403, 404) or self._account_validated:
+            return
+        self._account_validated = True
+        
+        accounts = self._fetch_accounts()
+        if accounts is None:
+            return
+        
+        # One pass serves both the lookup and the "available accounts" log
+        accounts_by_number = {acc.get('account', {}).get('account-number'): acc for acc in accounts}
+        account = accounts_by_number.get(self.account_number)
+        if account:
+            self.account = account
+        else:
+            logger.error(f"Account {self.account_number} not found")
+            logger.info(f"Available accounts: {list(accounts_by_number)}")
+    
     def get_option_chain(self, symbol: str) -> Optional[Dict]:
         """
         Get option chain for a symbol via REST API
@@ -497,79 +1005,151 @@ class TastyClient:
         Returns:
             Dict mapping expiration dates to lists of options
         """
-        try:
-            if not self._ensure_authenticated():
-                logger.error("Not authenticated")
-                return None
-            
-            url = f"{self.base_url}/option-chains/{symbol}/nested"
-            response = self.client.get(url, headers=self._get_headers())
+        cached = self._get_cached_chain(symbol)
+        if cached is not None:
+            return cached
+        
+        # One fetch per symbol at a time: threads that missed together wait for it
+        with self._chain_locks.setdefault(symbol, threading.Lock()):
+            cached = self._get_cached_chain(symbol)
+            if cached is not None:
+                return cached
             
-            if response.status_code != 200:
-                logger.error(f"Failed to get option chain: {response.status_code} - {response.text}")
+            try:
+                if not self._ensure_authenticated():
+                    logger.error("Not authenticated")
+                    return None
+                
+                url = f"/option-chains/{symbol}/nested"
+                response = self._get(url, headers=self._chain_revalidation_headers(symbol))
+                return self._store_chain_response(symbol, response)
+                
+            except Exception as e:
+                logger.error(f"Error getting option chain for {symbol}: {e}", exc_info=True)
                 return None
+    
+    def _get_cached_chain(self, symbol: str) -> Optional[Dict]:
+        """Return today's cached chain for symbol if it is younger than CHAIN_CACHE_TTL"""
+        fetched_at, _, chain = self._chain_cache.get((symbol, _today()), (0.0, None, None))
+        if chain is not None and time.monotonic() - fetched_at < self.CHAIN_CACHE_TTL:
+            return chain
+        return None
+    
+    def _chain_revalidation_headers(self, symbol: str) -> Optional[dict]:
+        """If-None-Match header for today's expired cached chain, if the server sent an ETag"""
+        _, etag, _ = self._chain_cache.get((symbol, _today()), (0.0, None, None))
+        return {'If-None-Match': etag} if etag else None
+    
+    def _store_chain_response(self, symbol: str, response: httpx.Response) -> Optional[Dict]:
+        """Cache and return the chain from an option-chain response (304 reuses the cached one)"""
+        if response.status_code == 304:
+            key = (symbol, _today())
+            entry = self._chain_cache.get(key)
+            if entry is None:
+                logger.warning(f"Option chain for {symbol} not modified but no longer cached")
+                return None
+            _, etag, chain = entry
+            # Refresh through the locked store so the entry also moves to the LRU end
+            self._cache_chain(symbol, chain, etag)
+            logger.debug(f"Option chain for {symbol} not modified")
+            return chain
+        
+        if response.status_code != 200:
+            logger.error(f"Failed to get option chain: {response.status_code} - {response.text}")
+            return None
+        
+        chain = self._parse_option_chain(symbol, orjson.loads(response.content))
+        self._cache_chain(symbol, chain, response.headers.get('etag'))
+        logger.debug(f"Retrieved option chain with {len(chain)} expirations")
+        return chain
+    
+    def _cache_chain(self, symbol: str, chain: Dict, etag: Optional[str] = None) -> Dict:
+        """
+        Store a freshly fetched or revalidated chain, dropping entries from previous
+        days and the least recently fetched symbols beyond CHAIN_CACHE_MAX_SYMBOLS
+        """
+        today = _today()
+        key = (symbol, today)
+        with self._chain_cache_lock:
+            # list() snapshots the keys atomically; lookups may run on several threads
+            for cached_key in list(self._chain_cache):
+                if cached_key[1] != today:
+                    self._chain_cache.pop(cached_key, None)
+            self._chain_cache.pop(key, None)
+            self._chain_cache[key] = (time.monotonic(), etag, chain)
+            while len(self._chain_cache) > self.CHAIN_CACHE_MAX_SYMBOLS:
+                self._chain_cache.popitem(last=False)
+        return chain
+    
+    def invalidate_chain(self, symbol: Optional[str] = None):
+        """
+        Drop cached option chains so the next lookup refetches
+        
+        Args:
+            symbol: Underlying to invalidate, or None for all
+        """
+        with self._chain_cache_lock:
+            if symbol is None:
+                self._chain_cache.clear()
+            else:
+                for key in list(self._chain_cache):
+                    if key[0] == symbol:
+                        self._chain_cache.pop(key, None)
+    
+    def _parse_option_chain(self, symbol: str, data: dict) -> Dict:
+        """Parse a nested option-chain response into dict[date, list[option]]"""
+        items = data.get('data', {}).get('items', [])
+        
+        # Parse into dict[date, list[option]]
+        chain = OptionChain()
+        
+        if not items:
+            logger.warning(f"Empty option chain for {symbol}")
+            return chain
+        
+        today = _today()
+        
+        for item in items:
+            expirations = item.get('expirations', [])
             
-            data = response.json()
-            items = data.get('data', {}).get('items', [])
-            
-            if not items:
-                logger.warning(f"Empty option chain for {symbol}")
-                return {}
-            
-            # Parse into dict[date, list[option]]
-            chain = {}
-            
-            for item in items:
-                expirations = item.get('expirations', [])
+            for expiration in expirations:
+                exp_date_str = expiration.get('expiration-date')
+                if not exp_date_str:
+                    continue
                 
-                for expiration in expirations:
-                    exp_date_str = expiration.get('expiration-date')
-                    if not exp_date_str:
-                        continue
-                    
-                    exp_date = datetime.strptime(exp_date_str, '%Y-%m-%d').date()
-                    dte = expiration.get('days-to-expiration', (exp_date - datetime.now().date()).days)
-                    strikes = expiration.get('strikes', [])
+                # Fixed YYYY-MM-DD layout: slicing is much cheaper than strptime
+                exp_date = date(int(exp_date_str[:4]), int(exp_date_str[5:7]), int(exp_date_str[8:10]))
+                dte = expiration.get('days-to-expiration')
+                if dte is None:
+                    dte = (exp_date - today).days
+                strikes = expiration.get('strikes', [])
+                
+                # Hot loop over every strike: bind lookups to locals
+                options = []
+                options_append = options.append
+                for strike_item in strikes:
+                    get = strike_item.get
+                    strike_price = float(get('strike-price'))
                     
-                    options = []
-                    for strike_item in strikes:
-                        strike_price = strike_item.get('strike-price')
-                        
-                        # Add call option
-                        call_symbol = strike_item.get('call')
-                        call_streamer = strike_item.get('call-streamer-symbol')
-                        if call_symbol:
-                            options.append({
-                                'symbol': call_symbol,
-                                'streamer_symbol': call_streamer,
-                                'option_type': 'C',
-                                'strike_price': Decimal(str(strike_price)),
-                                'expiration_date': exp_date,
-                                'dte': dte
-                            })
-                        
-                        # Add put option
-                        put_symbol = strike_item.get('put')
-                        put_streamer = strike_item.get('put-streamer-symbol')
-                        if put_symbol:
-                            options.append({
-                                'symbol': put_symbol,
-                                'streamer_symbol': put_streamer,
-                                'option_type': 'P',
-                                'strike_price': Decimal(str(strike_price)),
-                                'expiration_date': exp_date,
-                                'dte': dte
-                            })
+                    # Add call option
+                    call_symbol = get('call')
+                    if call_symbol:
+                        options_append(OptionContract(
+                            call_symbol, get('call-streamer-symbol'), 'C', strike_price, exp_date, dte
+                        ))
                     
-                    if options:
-                        chain[exp_date] = options
-            
-            logger.debug(f"Retrieved option chain with {len(chain)} expirations")
-            return chain
-            
-        except Exception as e:
-            logger.error(f"Error getting option chain for {symbol}: {e}", exc_info=True)
-            return None
+                    # Add put option
+                    put_symbol = get('put')
+                    if put_symbol:
+                        options_append(OptionContract(
+                            put_symbol, get('put-streamer-symbol'), 'P', strike_price, exp_date, dte
+                        ))
+                
+                if options:
+                    chain[exp_date] = options
+        
+        chain.index_strikes(today)
+        return chain
     
     def find_atm_option(self, symbol: str, option_type: str, underlying_price: float,
                        days_to_exp_min: int = 0, days_to_exp_max: int = 7) -> Optional[Dict]:
@@ -587,47 +1167,102 @@ class TastyClient:
             Dictionary with option details or None
         """
         try:
-            logger.debug(f"Finding ATM {option_type} for {symbol}, price={underlying_price}, DTE={days_to_exp_min}-{days_to_exp_max}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Finding ATM {option_type} for {symbol}, price={underlying_price}, DTE={days_to_exp_min}-{days_to_exp_max}")
             
             chain = self.get_option_chain(symbol)
             if not chain:
                 return None
+            self._subscribe_chain_window(chain, days_to_exp_min, days_to_exp_max)
             
-            # Filter by option type and DTE
+            # Closest strike per expiration in the DTE window (binary search on sorted
+            # strikes), then the closest overall; earlier expirations win ties
             target_type = 'C' if option_type.upper() == 'CALL' else 'P'
-            valid_options = []
-            
-            for exp_date, options_list in sorted(chain.items()):
-                dte = (exp_date - datetime.now().date()).days
-                
-                if days_to_exp_min <= dte <= days_to_exp_max:
-                    for opt in options_list:
-                        if opt['option_type'] == target_type:
-                            valid_options.append(opt)
-            
-            if not valid_options:
+            price = float(underlying_price)
+            best = None
+            
+            # Chains are cached per day, so the DTE index built at parse time is current
+            for exp_date in chain.expirations_between(days_to_exp_min, days_to_exp_max):
+                candidate = chain.nearest(exp_date, target_type, price)
+                if candidate is not None and (best is None or candidate[0] < best[0]):
+                    best = candidate
+                    if best[0] == 0:
+                        # Exact strike: no later expiration can beat it (ties keep the earlier)
+                        break
+            
+            if best is None:
                 logger.warning(f"No valid {option_type} options found for {symbol}")
                 return None
             
-            logger.debug(f"Found {len(valid_options)} valid {option_type} options")
-            
-            # Find ATM (closest strike to underlying price)
-            atm_option = min(valid_options, key=lambda opt: abs(float(opt['strike_price']) - float(underlying_price)))
+            atm_option = best[1]
             
             return {
-                'symbol': atm_option['symbol'],
-                'streamer_symbol': atm_option['streamer_symbol'],
+                'symbol': atm_option.symbol,
+                'streamer_symbol': atm_option.streamer_symbol,
                 'underlying': symbol,
                 'option_type': option_type.upper(),
-                'strike': float(atm_option['strike_price']),
-                'expiration': atm_option['expiration_date'].strftime('%Y-%m-%d'),
-                'dte': atm_option['dte']
+                'strike': atm_option.strike_price,
+                'expiration': atm_option.expiration_date.isoformat(),
+                'dte': atm_option.dte
             }
             
         except Exception as e:
             logger.error(f"Error finding ATM option: {e}", exc_info=True)
             return None
     
+    def _subscribe_chain_window(self, chain: OptionChain, dte_min: int, dte_max: int):
+        """
+        Subscribe every option of a chain's DTE window in one go (once per chain), so
+        quotes are already streaming when the strikes around ATM are looked up
+        """
+        window = (dte_min, dte_max)
+        if window in chain.subscribed_windows:
+            return
+        
+        queued = self._subscribe_streamer_symbols(
+            opt.streamer_symbol
+            for exp_date in chain.expirations_between(dte_min, dte_max)
+            for opt in chain[exp_date]
+            if opt.streamer_symbol
+        )
+        # Only mark the window once its symbols went out; otherwise retry next lookup
+        if queued is not None:
+            chain.subscribed_windows.add(window)
+    
+    def get_option_by_symbol(self, underlying: str, option_symbol: str) -> Optional[OptionContract]:
+        """
+        Look up an option of a (cached) chain by its OCC or streamer symbol
+        
+        Args:
+            underlying: Underlying symbol
+            option_symbol: OCC or streamer option symbol
+            
+        Returns:
+            The option, or None if the chain is unavailable or has no such option
+        """
+        chain = self.get_option_chain(underlying)
+        if not chain:
+            return None
+        return chain.by_symbol.get(option_symbol)
+    
+    def find_atm_options_bulk(self, specs: List[tuple], max_workers: int = 10) -> List[Optional[Dict]]:
+        """
+        Run several find_atm_option lookups concurrently
+        
+        Args:
+            specs: find_atm_option argument tuples, e.g. (symbol, option_type, underlying_price[, dte_min, dte_max])
+            max_workers: Thread count (kept below the HTTP pool's max_connections)
+            
+        Returns:
+            Results in the same order as specs
+        """
+        if len(specs) <= 1:
+            return [self.find_atm_option(*spec) for spec in specs]
+        
+        # httpx.Client is thread-safe, so chain fetches overlap on the shared pool
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as executor:
+            return list(executor.map(lambda spec: self.find_atm_option(*spec), specs))
+    
     def _occ_to_streamer(self, occ_symbol: str) -> str:
         """
         Convert OCC option symbol to streamer format
@@ -638,168 +1273,184 @@ class TastyClient:
         Returns:
             Streamer format like ".SPY251031C370"
         """
+        return _occ_to_streamer_cached(occ_symbol)
+    
+    def _to_streamer_symbol(self, symbol: str) -> str:
+        """Streamer symbol for an equity, streamer-format or OCC option symbol"""
+        # Only OCC symbols contain a space; equities and streamer symbols pass through
+        if ' ' in symbol:
+            return self._occ_to_streamer(symbol)
+        return symbol
+    
+    def _subscribe_streamer_symbols(self, streamer_symbols) -> Optional[List[str]]:
+        """
+        Queue not-yet-subscribed streamer symbols; returns the newly queued ones, or
+        None if the stream is down (best effort: REST lookups never depend on it)
+        """
+        ws_loop = self.ws_loop
+        if ws_loop is None or not ws_loop.is_running():
+            return None
+        
+        subscribed = self.subscribed_symbols
+        new_symbols = list(dict.fromkeys(s for s in streamer_symbols if s not in subscribed))
+        if not new_symbols:
+            return []
+        
+        # Register before queueing so the first quote can never be missed
+        quote_ready = self.quote_ready
+        for symbol in new_symbols:
+            if symbol not in quote_ready:
+                quote_ready[symbol] = threading.Event()
+        
         try:
-            # Remove extra spaces and parse
-            parts = occ_symbol.split()
-            if len(parts) != 2:
-                return occ_symbol
-            
-            ticker = parts[0]
-            rest = parts[1]
-            
-            # Format: YYMMDDCPPPPPPP0
-            # Extract: date (6), C/P (1), strike (8)
-            if len(rest) < 15:
-                return occ_symbol
-            
-            date_part = rest[:6]  # YYMMDD -> YYMMDD
-            option_type = rest[6]  # C or P
-            strike_raw = rest[7:15]  # 00370000
-            
-            # Convert strike: 00370000 -> 370
-            strike = str(int(strike_raw) / 1000)
-            if '.' in strike:
-                strike = strike.rstrip('0').rstrip('.')
+            ws_loop.call_soon_threadsafe(self._queue_subscriptions, new_symbols)
+        except RuntimeError as e:
+            # The loop closed after the check above
+            logger.warning(f"WebSocket loop unavailable, not subscribing {len(new_symbols)} symbols: {e}")
+            return None
+        return new_symbols
+    
+    def prefetch(self, symbols: List[str]) -> List[str]:
+        """
+        Subscribe to all not-yet-subscribed symbols; requests from concurrent callers
+        are coalesced into batched FEED_SUBSCRIPTION frames on the WebSocket loop
+        
+        Args:
+            symbols: Equity, streamer-format or OCC option symbols
             
-            # Build streamer symbol: .SPY251031C370
-            streamer = f".{ticker}{date_part}{option_type}{strike}"
-            return streamer
+        Returns:
+            Streamer symbols that were newly subscribed
+        """
+        return self._subscribe_streamer_symbols(map(self._to_streamer_symbol, symbols)) or []
+    
+    def get_quotes_bulk(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Get current quotes for many symbols from the WebSocket stream with a single wait
+        
+        Args:
+            symbols: Equity, streamer-format or OCC option symbols
             
-        except Exception as e:
-            logger.debug(f"Error converting OCC to streamer: {e}")
-            return occ_symbol
+        Returns:
+            Dict mapping each symbol with data to bid, ask, last and mark
+            (mark is the bid/ask midpoint, else last, else 0)
+        """
+        streamer_symbols = {symbol: self._to_streamer_symbol(symbol) for symbol in symbols}
+        hot_until = time.time() + self.HOT_QUOTE_TTL
+        for streamer_symbol in streamer_symbols.values():
+            self._hot_symbols[streamer_symbol] = hot_until
+        self._subscribe_streamer_symbols(streamer_symbols.values())
+        
+        # Block only until each missing symbol's first quote arrives, sharing one deadline
+        deadline = time.monotonic() + self.QUOTE_WAIT_TIMEOUT
+        missing = []
+        for streamer_symbol in streamer_symbols.values():
+            if streamer_symbol in self._sym2idx:
+                continue
+            ready = self.quote_ready.get(streamer_symbol)
+            if ready is None or not ready.wait(max(deadline - time.monotonic(), 0)):
+                missing.append(streamer_symbol)
+        if missing:
+            logger.warning(f"No quote received for {missing} within {self.QUOTE_WAIT_TIMEOUT}s")
+        
+        sym2idx = self._sym2idx
+        found = [(symbol, sym2idx[s]) for symbol, s in streamer_symbols.items() if s in sym2idx]
+        if not found:
+            return {}
+        self._decode_raw_quotes(streamer_symbols[symbol] for symbol, _ in found)
+        
+        # One gather per array; slots are looked up first so the arrays already cover them
+        idxs = [idx for _, idx in found]
+        bids = self._bid[idxs].tolist()
+        asks = self._ask[idxs].tolist()
+        lasts = self._last[idxs].tolist()
+        
+        quotes = {}
+        for (symbol, _), bid, ask, last in zip(found, bids, asks, lasts):
+            quotes[symbol] = {
+                'symbol': symbol,
+                'bid': bid,
+                'ask': ask,
+                'last': last,
+                'mark': (bid + ask) / 2 if (bid > 0 and ask > 0) else last
+            }
+        return quotes
     
-    def get_option_quote(self, option_symbol: str) -> Optional[Dict]:
+    def get_option_quote(self, option_symbol: str, quotes: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
         """
         Get current quote for an option from WebSocket stream
         
         Args:
             option_symbol: Option symbol (OCC format with spaces or streamer format)
                           Examples: "SPY   251031C00370000" or ".SPY251031C370"
+            quotes: Optional quotes already fetched with get_quotes_bulk; a symbol
+                    missing from them has no data (it is not waited for again)
             
         Returns:
             Dictionary with bid, ask, last, mark prices
         """
         try:
-            # Use streamer symbol for WebSocket
-            if option_symbol.startswith('.'):
-                streamer_symbol = option_symbol
-            else:
-                # Convert OCC to streamer format
-                streamer_symbol = self._occ_to_streamer(option_symbol)
-            
-            # Subscribe to symbol if not already subscribed
-            if streamer_symbol not in self.subscribed_symbols:
-                if self.ws_loop:
-                    asyncio.run_coroutine_threadsafe(
-                        self._subscribe_symbols([streamer_symbol]),
-                        self.ws_loop
-                    )
-                    # Wait a bit for subscription
-                    time.sleep(0.5)
-            
-            # Get from cache
-            if streamer_symbol in self.quote_cache:
-                quote = self.quote_cache[streamer_symbol]
-                bid = quote.get('bid', 0) or 0
-                ask = quote.get('ask', 0) or 0
-                last = quote.get('last', 0) or 0
-                mark = quote.get('mark', 0) or 0
-                
-                # Calculate mark if needed
-                if mark == 0 and bid > 0 and ask > 0:
-                    mark = (bid + ask) / 2
-                elif mark == 0:
-                    mark = last
-                
-                return {
-                    'symbol': option_symbol,
-                    'bid': bid,
-                    'ask': ask,
-                    'last': last,
-                    'mark': mark if mark > 0 else 0.01
-                }
-            else:
-                logger.warning(f"No cached quote for {option_symbol}, waiting for data...")
-                # Wait a bit and try again
-                time.sleep(1)
-                if streamer_symbol in self.quote_cache:
-                    quote = self.quote_cache[streamer_symbol]
-                    bid = quote.get('bid', 0) or 0
-                    ask = quote.get('ask', 0) or 0
-                    last = quote.get('last', 0) or 0
-                    mark = (bid + ask) / 2 if (bid > 0 and ask > 0) else last
-                    
-                    return {
-                        'symbol': option_symbol,
-                        'bid': bid,
-                        'ask': ask,
-                        'last': last,
-                        'mark': mark if mark > 0 else 0.01
-                    }
+            if quotes is None:
+                quotes = self.get_quotes_bulk([option_symbol])
+            
+            quote = quotes.get(option_symbol)
+            if quote is None:
                 return None
+            
+            return {**quote, 'mark': quote['mark'] if quote['mark'] > 0 else 0.01}
                 
         except Exception as e:
-            logger.error(f"Error getting option quote: {e}", exc_info=True)
+            logger.error(f"Error getting option quote: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
     
-    def get_underlying_price(self, symbol: str) -> Optional[float]:
+    def get_underlying_price(self, symbol: str, quotes: Optional[Dict[str, Dict]] = None) -> Optional[float]:
         """
         Get current price of underlying symbol from WebSocket stream
         
         Args:
             symbol: Underlying ticker symbol
+            quotes: Optional quotes already fetched with get_quotes_bulk; a symbol
+                    missing from them has no data (it is not waited for again)
             
         Returns:
             Current price or None
         """
         try:
-            # Subscribe to symbol if not already subscribed
-            if symbol not in self.subscribed_symbols:
-                if self.ws_loop:
-                    asyncio.run_coroutine_threadsafe(
-                        self._subscribe_symbols([symbol]),
-                        self.ws_loop
-                    )
-                    # Wait a bit for subscription
-                    time.sleep(0.5)
-            
-            # Get from cache
-            if symbol in self.quote_cache:
-                quote = self.quote_cache[symbol]
-                bid = quote.get('bid', 0) or 0
-                ask = quote.get('ask', 0) or 0
-                last = quote.get('last', 0) or 0
-                
-                if bid > 0 and ask > 0:
-                    price = (bid + ask) / 2
-                    logger.debug(f"{symbol}: bid={bid}, ask={ask}, mark={price}")
-                    return price
-                elif last > 0:
-                    logger.debug(f"{symbol}: last={last}")
-                    return last
-                else:
-                    logger.warning(f"{symbol}: no valid price data in cache")
-                    return None
-            else:
-                logger.warning(f"No cached quote for {symbol}, waiting for data...")
-                # Wait a bit and try again
-                time.sleep(1)
-                if symbol in self.quote_cache:
-                    quote = self.quote_cache[symbol]
-                    bid = quote.get('bid', 0) or 0
-                    ask = quote.get('ask', 0) or 0
-                    last = quote.get('last', 0) or 0
-                    
-                    if bid > 0 and ask > 0:
-                        return (bid + ask) / 2
-                    return last if last > 0 else None
+            if quotes is None:
+                quotes = self.get_quotes_bulk([symbol])
+            
+            quote = quotes.get(symbol)
+            if quote is None:
                 return None
+            
+            if quote['mark'] > 0:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"{symbol}: bid={quote['bid']}, ask={quote['ask']}, last={quote['last']}, mark={quote['mark']}")
+                return quote['mark']
+            
+            logger.warning(f"{symbol}: no valid price data in cache")
+            return None
                 
         except Exception as e:
-            logger.error(f"Error getting price for {symbol}: {e}", exc_info=True)
+            logger.error(f"Error getting price for {symbol}: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
     
+    def get_underlying_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Get current prices of many underlyings with one shared wait for missing quotes
+        
+        Args:
+            symbols: Underlying ticker symbols
+            
+        Returns:
+            Dict mapping each symbol to its price, or None if it has no valid price
+        """
+        try:
+            quotes = self.get_quotes_bulk(symbols)
+        except Exception as e:
+            logger.error(f"Error getting prices for {symbols}: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
+            return dict.fromkeys(symbols)
+        return {symbol: self.get_underlying_price(symbol, quotes) for symbol in symbols}
+    
     def place_order(self, option_symbol: str, quantity: int, action: str = 'BUY',
                    order_type: str = 'MARKET', limit_price: Optional[float] = None) -> Optional[str]:
         """
@@ -814,45 +1465,51 @@ class TastyClient:
             
         Returns:
             Order ID if successful, None otherwise
+            
+        Raises:
+            ValueError: If action or order_type is not one of the values above
         """
+        # Validate before anything is sent; an unknown action used to become "Sell to Close"
+        order_action = _ORDER_ACTIONS.get(action) or _ORDER_ACTIONS.get(action.upper())
+        api_order_type = _ORDER_TYPES.get(order_type) or _ORDER_TYPES.get(order_type.upper())
+        if order_action is None:
+            raise ValueError(f"Unknown order action: {action!r}")
+        if api_order_type is None:
+            raise ValueError(f"Unknown order type: {order_type!r}")
+        
         try:
             if not self._ensure_authenticated():
                 logger.error("Not authenticated")
                 return None
             
             # Prepare order payload
-            order_action = "Buy to Open" if action.upper() == 'BUY' else "Sell to Close"
-            
-            leg = {
-                "instrument-type": "Equity Option",
-                "symbol": option_symbol,
-                "quantity": str(quantity),
-                "action": order_action
-            }
-            
             order_payload = {
-                "time-in-force": "Day",
-                "order-type": order_type.title(),
-                "legs": [leg]
+                **self.ORDER_TEMPLATE,
+                "order-type": api_order_type,
+                "legs": [{
+                    **self.LEG_TEMPLATE,
+                    "symbol": option_symbol,
+                    "quantity": str(quantity),
+                    "action": order_action
+                }]
             }
             
-            if order_type.upper() == 'LIMIT' and limit_price:
-                order_payload["price"] = str(limit_price)
-            
-            # For dry-run (paper trading simulation)
-            order_payload["dry-run"] = True
+            if api_order_type == 'Limit' and limit_price:
+                # Explicit cent precision instead of relying on float repr
+                order_payload["price"] = f"{limit_price:.2f}"
             
             env_type = "PAPER" if self.paper_trading else "LIVE"
             logger.info(f"Placing {env_type} order: {action} {quantity}x {option_symbol}")
             
-            url = f"{self.base_url}/accounts/{self.account_number}/orders"
-            response = self.client.post(url, json=order_payload, headers=self._get_headers())
+            url = f"/accounts/{self.account_number}/orders"
+            response = self.client.post(url, content=orjson.dumps(order_payload))
             
             if response.status_code not in [200, 201]:
                 logger.error(f"Order placement failed: {response.status_code} - {response.text}")
+                self._check_account_access(response.status_code)
                 return None
             
-            data = response.json()
+            data = orjson.loads(response.content)
             order_data = data.get('data', {})
             
             # Extract order ID
@@ -863,6 +1520,7 @@ class TastyClient:
             
             if order_id:
                 logger.info(f"✓ {env_type} order placed successfully: ID={order_id}")
+                self.invalidate_account_cache()
                 return str(order_id)
             else:
                 logger.warning(f"Order response missing ID: {data}")
@@ -879,38 +1537,51 @@ class TastyClient:
         Returns:
             List of position dictionaries
         """
+        cached = self._get_account_cached('positions')
+        if cached is not None:
+            return cached
+        
         try:
             if not self._ensure_authenticated():
                 logger.error("Not authenticated")
                 return []
             
-            url = f"{self.base_url}/accounts/{self.account_number}/positions"
-            response = self.client.get(url, headers=self._get_headers())
+            url = f"/accounts/{self.account_number}/positions"
+            response = self._get(url)
             
             if response.status_code != 200:
                 logger.error(f"Failed to get positions: {response.status_code}")
+                self._check_account_access(response.status_code)
                 return []
             
-            data = response.json()
-            items = data.get('data', {}).get('items', [])
-            
-            result = []
-            for pos in items:
-                if pos.get('instrument-type') == 'Equity Option':
-                    result.append({
-                        'symbol': pos.get('symbol'),
-                        'quantity': pos.get('quantity'),
-                        'average_price': pos.get('average-open-price'),
-                        'current_price': pos.get('mark-price'),
-                        'pnl': pos.get('realized-day-gain-loss', 0)
-                    })
-            
-            return result
+            return self._set_account_cached('positions', self._parse_positions(orjson.loads(response.content)))
             
         except Exception as e:
-            logger.error(f"Error getting positions: {e}", exc_info=True)
+            logger.error(f"Error getting positions: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
     
+    def _get_account_cached(self, key: str):
+        """Positions or balance fetched within ACCOUNT_CACHE_TTL, or None"""
+        fetched_at, value = self._account_cache.get(key, (0.0, None))
+        if value is not None and time.monotonic() - fetched_at < self.ACCOUNT_CACHE_TTL:
+            return value
+        return None
+    
+    def _set_account_cached(self, key: str, value):
+        """Remember a successfully fetched positions list or balance"""
+        self._account_cache[key] = (time.monotonic(), value)
+        return value
+    
+    def invalidate_account_cache(self):
+        """Drop memoized positions and balance so the next call refetches"""
+        self._account_cache.clear()
+    
+    def _parse_positions(self, data: dict) -> List[Dict]:
+        """Extract equity-option positions from a positions response"""
+        items = data.get('data', {}).get('items', [])
+        
+        return [_POSITION_FIELDS(pos) for pos in items if pos.get('instrument-type') == 'Equity Option']
+    
     def get_account_balance(self) -> Dict:
         """
         Get account balance information via REST API
@@ -918,28 +1589,206 @@ class TastyClient:
         Returns:
             Dictionary with balance info
         """
+        cached = self._get_account_cached('balance')
+        if cached is not None:
+            return cached
+        
         try:
             if not self._ensure_authenticated():
                 logger.error("Not authenticated")
                 return {}
             
-            url = f"{self.base_url}/accounts/{self.account_number}/balances"
-            response = self.client.get(url, headers=self._get_headers())
+            url = f"/accounts/{self.account_number}/balances"
+            response = self._get(url)
             
             if response.status_code != 200:
                 logger.error(f"Failed to get balances: {response.status_code}")
+                self._check_account_access(response.status_code)
                 return {}
             
-            data = response.json()
-            balance_data = data.get('data', {})
+            return self._set_account_cached('balance', self._parse_balance(orjson.loads(response.content)))
             
-            return {
-                'cash': balance_data.get('cash-balance', 0),
-                'buying_power': balance_data.get('derivative-buying-power', 0),
-                'equity': balance_data.get('net-liquidating-value', 0),
-                'pnl_today': balance_data.get('realized-day-gain-loss', 0)
-            }
+        except Exception as e:
+            logger.error(f"Error getting balance: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
+            return {}
+    
+    def _parse_balance(self, data: dict) -> Dict:
+        """Extract the balance fields used by the bot from a balances response"""
+        return _BALANCE_FIELDS(data.get('data', {}))
+    
+    # ==================== ASYNC REST ====================
+    
+    def _start_rest_loop(self):
+        """Start the background event loop that owns the async HTTP client"""
+        if self.rest_loop is not None:
+            return
+        
+        self.rest_loop = asyncio.new_event_loop()
+        self.async_client = httpx.AsyncClient(**self._http_client_options(httpx.AsyncHTTPTransport))
+        threading.Thread(target=self.rest_loop.run_forever, name='tasty-rest', daemon=True).start()
+    
+    def _run_async(self, coro):
+        """Run a coroutine on the REST loop and block until it finishes"""
+        self._start_rest_loop()
+        return asyncio.run_coroutine_threadsafe(coro, self.rest_loop).result()
+    
+    async def _ensure_authenticated_async(self) -> bool:
+        """Async variant of _ensure_authenticated; concurrent callers share one refresh"""
+        if self._async_auth_lock is None:
+            # Created on the REST loop so it binds to that loop
+            self._async_auth_lock = asyncio.Lock()
+        async with self._async_auth_lock:
+            if self.session_token and not self._is_token_expired():
+                return True
+            # The sync path holds the cross-thread lock, so keep it off the loop
+            return await asyncio.get_running_loop().run_in_executor(None, self._ensure_authenticated)
+    
+    async def _get_async(self, url: str, headers: Optional[dict] = None) -> httpx.Response:
+        """Async variant of _get"""
+        attempt = 0
+        while True:
+            response = await self.async_client.get(url, headers=headers)
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def _get_json_async(self, url: str) -> Optional[dict]:
+        """GET a REST endpoint on the async client, returning the decoded body or None"""
+        if not await self._ensure_authenticated_async():
+            logger.error("Not authenticated")
+            return None
+        
+        response = await self._get_async(url)
+        if response.status_code != 200:
+            logger.error(f"GET {url} failed: {response.status_code} - {response.text}")
+            if url.startswith('/accounts/'):
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._check_account_access, response.status_code
+                )
+            return None
+        
+        return orjson.loads(response.content)
+    
+    async def get_option_chain_async(self, symbol: str) -> Optional[Dict]:
+        """Async variant of get_option_chain"""
+        cached = self._get_cached_chain(symbol)
+        if cached is not None:
+            return cached
+        
+        try:
+            if not await self._ensure_authenticated_async():
+                logger.error("Not authenticated")
+                return None
             
+            response = await self._get_async(
+                f"/option-chains/{symbol}/nested", headers=self._chain_revalidation_headers(symbol)
+            )
+            return self._store_chain_response(symbol, response)
+        except Exception as e:
+            logger.error(f"Error getting option chain for {symbol}: {e}", exc_info=True)
+            return None
+    
+    async def get_positions_async(self) -> List[Dict]:
+        """Async variant of get_positions"""
+        cached = self._get_account_cached('positions')
+        if cached is not None:
+            return cached
+        
+        try:
+            data = await self._get_json_async(f"/accounts/{self.account_number}/positions")
+            return [] if data is None else self._set_account_cached('positions', self._parse_positions(data))
         except Exception as e:
-            logger.error(f"Error getting balance: {e}", exc_info=True)
+            logger.error(f"Error getting positions: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
+            return []
+    
+    async def get_account_balance_async(self) -> Dict:
+        """Async variant of get_account_balance"""
+        cached = self._get_account_cached('balance')
+        if cached is not None:
+            return cached
+        
+        try:
+            data = await self._get_json_async(f"/accounts/{self.account_number}/balances")
+            return {} if data is None else self._set_account_cached('balance', self._parse_balance(data))
+        except Exception as e:
+            logger.error(f"Error getting balance: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return {}
+    
+    async def get_option_chains_async(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch option chains for several underlyings concurrently"""
+        chains = await asyncio.gather(*(self.get_option_chain_async(s) for s in symbols))
+        return dict(zip(symbols, chains))
+    
+    def get_option_chains(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch option chains for several underlyings concurrently
+        
+        Args:
+            symbols: Underlying symbols
+            
+        Returns:
+            Dict mapping each symbol to its chain (None if the fetch failed)
+        """
+        return self._run_async(self.get_option_chains_async(symbols))
+    
+    def get_account_snapshot(self) -> Dict:
+        """
+        Fetch positions and balances concurrently
+        
+        Returns:
+            Dictionary with 'positions' and 'balance'
+        """
+        async def fetch():
+            return await asyncio.gather(self.get_positions_async(), self.get_account_balance_async())
+        
+        positions, balance = self._run_async(fetch())
+        return {'positions': positions, 'balance': balance}
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking client call on the client's worker threads, off the caller's loop"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.EXECUTOR_WORKERS, thread_name_prefix="tasty"
+                    )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+    
+    async def place_order_async(self, *args, **kwargs) -> Optional[str]:
+        """Async variant of place_order"""
+        return await self._run_blocking(self.place_order, *args, **kwargs)
+    
+    async def get_underlying_price_async(self, symbol: str) -> Optional[float]:
+        """Async variant of get_underlying_price (may wait for a first quote)"""
+        return await self._run_blocking(self.get_underlying_price, symbol)
+    
+    async def get_option_quote_async(self, option_symbol: str) -> Optional[Dict]:
+        """Async variant of get_option_quote (may wait for a first quote)"""
+        return await self._run_blocking(self.get_option_quote, option_symbol)
+
+
+# Process-wide client so token refresh, cached chains and pooled connections are shared
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> TastyClient:
+    """Get the shared TastyClient, creating it from settings on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from config.settings import (
+                    TASTY_CLIENT_SECRET, TASTY_REFRESH_TOKEN, TASTY_ACCOUNT_NUMBER, PAPER_TRADING
+                )
+                _client = TastyClient(
+                    TASTY_CLIENT_SECRET,
+                    TASTY_REFRESH_TOKEN,
+                    TASTY_ACCOUNT_NUMBER,
+                    PAPER_TRADING
+                )
+    return _client
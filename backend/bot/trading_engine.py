@@ -5,6 +5,7 @@ Based on Pine Script: Buys options when price breaks above today's open
 import logging
 from datetime import datetime, time
 from typing import Dict, Optional
+from sqlalchemy import exists, func
 from models.database import get_session, Ticker, Trade, PriceCache, BotStatus
 from bot.tasty_client import TastyClient
 from config.settings import (
@@ -137,7 +138,9 @@ class TradingEngine:
         finally:
             session.close()
     
-    def check_entry_signal(self, ticker_config: Dict, option_type: str) -> Optional[Dict]:
+    def check_entry_signal(self, ticker_config: Dict, option_type: str,
+                           underlying_price: Optional[float] = None,
+                           option: Optional[Dict] = None) -> Optional[Dict]:
         """
         Check if entry conditions are met for a ticker option
         
@@ -146,25 +149,29 @@ class TradingEngine:
         Args:
             ticker_config: Ticker configuration from database
             option_type: 'CALL' or 'PUT'
+            underlying_price: Underlying price if already fetched
+            option: ATM option if already found
             
         Returns:
             Dictionary with trade details if signal found, None otherwise
         """
         try:
             # Get underlying price
-            underlying_price = self.client.get_underlying_price(ticker_config['symbol'])
+            if underlying_price is None:
+                underlying_price = self.client.get_underlying_price(ticker_config['symbol'])
             if not underlying_price:
                 logger.warning(f"Could not get underlying price for {ticker_config['symbol']}")
                 return None
             
             # Find ATM option
-            option = self.client.find_atm_option(
-                ticker_config['symbol'],
-                option_type.lower(),
-                underlying_price,
-                DAYS_TO_EXPIRATION_MIN,
-                DAYS_TO_EXPIRATION_MAX
-            )
+            if option is None:
+                option = self.client.find_atm_option(
+                    ticker_config['symbol'],
+                    option_type.lower(),
+                    underlying_price,
+                    DAYS_TO_EXPIRATION_MIN,
+                    DAYS_TO_EXPIRATION_MAX
+                )
             
             if not option:
                 logger.warning(f"Could not find ATM option for {ticker_config['symbol']} {option_type}")
@@ -248,21 +255,21 @@ class TradingEngine:
         session = get_session()
         try:
             # Check if we already have an open position for this exact option
-            existing = session.query(Trade).filter_by(
-                ticker=signal['ticker'],
-                option_symbol=signal['option_symbol'],
-                status='OPEN'
-            ).first()
+            existing = session.query(exists().where(
+                Trade.ticker == signal['ticker'],
+                Trade.option_symbol == signal['option_symbol'],
+                Trade.status == 'OPEN'
+            )).scalar()
             
             if existing:
                 logger.info(f"Already have open position for {signal['option_symbol']}")
                 return False
             
             # Check max positions per ticker
-            open_positions = session.query(Trade).filter_by(
-                ticker=signal['ticker'],
-                status='OPEN'
-            ).count()
+            open_positions = session.query(func.count(Trade.id)).filter(
+                Trade.ticker == signal['ticker'],
+                Trade.status == 'OPEN'
+            ).scalar()
             
             if open_positions >= ticker_config['max_positions']:
                 logger.info(f"Max positions ({ticker_config['max_positions']}) reached for {signal['ticker']}")
@@ -318,7 +325,8 @@ class TradingEngine:
         finally:
             session.close()
     
-    def process_ticker(self, ticker_symbol: str, ticker_threshold: float, ticker_max_positions: int, ticker_capital_per_trade: float):
+    def process_ticker(self, ticker_symbol: str, ticker_threshold: float, ticker_max_positions: int, ticker_capital_per_trade: float,
+                       underlying_price: Optional[float] = None):
         """
         Process a single ticker for trading signals
         
@@ -327,6 +335,7 @@ class TradingEngine:
             ticker_threshold: Price threshold percentage
             ticker_max_positions: Max positions allowed
             ticker_capital_per_trade: Capital allocated per trade
+            underlying_price: Underlying price already fetched in a batch (fetched here if None)
         """
         try:
             # Create a lightweight ticker config dict to avoid session issues
@@ -337,13 +346,25 @@ class TradingEngine:
                 'capital_per_trade': ticker_capital_per_trade
             }
             
+            # Underlying price once for both sides, then both ATM lookups concurrently
+            if underlying_price is None:
+                underlying_price = self.client.get_underlying_price(ticker_symbol)
+            if not underlying_price:
+                logger.warning(f"Could not get underlying price for {ticker_symbol}")
+                return
+            
+            call_option, put_option = self.client.find_atm_options_bulk([
+                (ticker_symbol, option_type, underlying_price, DAYS_TO_EXPIRATION_MIN, DAYS_TO_EXPIRATION_MAX)
+                for option_type in ('call', 'put')
+            ])
+            
             # Check CALL option signal
-            call_signal = self.check_entry_signal(ticker_config, 'CALL')
+            call_signal = self.check_entry_signal(ticker_config, 'CALL', underlying_price, call_option)
             if call_signal:
                 self.execute_trade(call_signal, ticker_config)
             
             # Check PUT option signal
-            put_signal = self.check_entry_signal(ticker_config, 'PUT')
+            put_signal = self.check_entry_signal(ticker_config, 'PUT', underlying_price, put_option)
             if put_signal:
                 self.execute_trade(put_signal, ticker_config)
                 
@@ -361,17 +382,20 @@ class TradingEngine:
             
             logger.debug(f"Updating {len(open_trades)} open positions...")
             
+            # One subscription batch and one wait for every open position
+            quotes = self.client.get_quotes_bulk([trade.option_symbol for trade in open_trades])
+            
             for trade in open_trades:
                 try:
                     # Get current quote for the option
-                    quote = self.client.get_option_quote(trade.option_symbol)
+                    quote = self.client.get_option_quote(trade.option_symbol, quotes)
                     if quote and quote['mark'] > 0:
                         # Update current price
                         trade.exit_price = quote['mark']
                         
                         # Calculate P&L
                         # P&L = (current_price - entry_price) * quantity * 100
-                        trade.pnl = (trade.exit_price - trade.entry_price) * trade.quantity * 100
+                        trade.pnl = round((trade.exit_price - trade.entry_price) * trade.quantity * 100, 2)
                         
                         logger.debug(
                             f"{trade.ticker} {trade.option_type} ${trade.strike}: "
@@ -417,14 +441,35 @@ class TradingEngine:
                 
                 logger.info(f"Processing {len(tickers)} enabled ticker(s)")
                 
+                # Subscribe every underlying in one batch and warm the option-chain
+                # cache concurrently before the per-ticker checks
+                symbols = [ticker.symbol for ticker in tickers]
+                prices = None
+                try:
+                    self.client.prefetch(symbols)
+                    self.client.get_option_chains(symbols)
+                    # Quotes have been streaming during the chain fetch; read them in one batch
+                    prices = self.client.get_underlying_prices(symbols)
+                except Exception as e:
+                    # Only a warm-up: each ticker fetches whatever it is missing itself
+                    logger.warning(f"Batch prefetch failed, fetching per ticker: {e}")
+                
                 # Process each ticker (extract values to avoid session issues)
                 for ticker in tickers:
                     logger.info(f"Checking {ticker.symbol} (threshold: {ticker.threshold}%)...")
+                    underlying_price = None
+                    if prices is not None:
+                        # The batch already waited for this quote; don't wait for it again
+                        underlying_price = prices.get(ticker.symbol)
+                        if not underlying_price:
+                            logger.warning(f"Could not get underlying price for {ticker.symbol}")
+                            continue
                     self.process_ticker(
                         ticker.symbol,
                         ticker.threshold,
                         ticker.max_positions,
-                        ticker.capital_per_trade
+                        ticker.capital_per_trade,
+                        underlying_price
                     )
                 
                 # Update existing positions with current prices
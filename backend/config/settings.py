@@ -24,6 +24,8 @@ DEFAULT_THRESHOLD = float(os.getenv('DEFAULT_THRESHOLD', 0.5))
 
 # Server Configuration
 PORT = int(os.getenv('PORT', 5000))
+# Worker processes for the standalone API (python -m api.app); run.py always uses one
+API_WORKERS = int(os.getenv('API_WORKERS', 1))
 DEBUG = os.getenv('DEBUG', 'true').lower() == 'true'
 CORS_ORIGINS = os.getenv(
     'CORS_ORIGINS', 
@@ -32,6 +34,10 @@ CORS_ORIGINS = os.getenv(
 
 # Database Configuration
 DATABASE_PATH = os.path.join(BASE_DIR, os.getenv('DATABASE_PATH', 'data/trading_bot.db'))
+DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{DATABASE_PATH}')
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 20))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))  # seconds
 
 # Logging Configuration
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
@@ -47,6 +53,7 @@ TRADING_END_MINUTE = 0
 PRICE_UPDATE_INTERVAL = 300  # 5 minutes (300 seconds) for 5-min candles
 POSITION_UPDATE_INTERVAL = 60  # Check positions every 60 seconds
 SIGNAL_CHECK_INTERVAL = 60  # Check for signals every 60 seconds
+API_CACHE_TTL = 1.0  # Reuse polled dashboard aggregates (status, stats) for 1 second
 
 # Risk Management
 MAX_DAILY_LOSS = 2000  # Maximum loss per day in dollars
@@ -1,14 +1,39 @@
 """
 Database models and management
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, JSON, Index, Numeric, cast, func, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
 from datetime import datetime
 import os
+import bcrypt
 
 Base = declarative_base()
 
+# Prefixes of bcrypt hashes; any other stored passkey is a legacy plaintext value
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+DEFAULT_PASSKEY = 'admin123'
+
+# asyncio drivers used by the API for each database backend
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+
+def to_async_url(db_url):
+    """Map a database URL onto the asyncio driver for its backend"""
+    url = make_url(db_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def hash_passkey(passkey):
+    """Hash a passkey with bcrypt"""
+    return bcrypt.hashpw(passkey.encode(), bcrypt.gensalt(12)).decode()
+
 
 class Ticker(Base):
     """Ticker configuration model"""
@@ -29,7 +54,7 @@ class Trade(Base):
     __tablename__ = 'trades'
     
     id = Column(Integer, primary_key=True)
-    ticker = Column(String(10), nullable=False)
+    ticker = Column(String(10), nullable=False, index=True)
     option_type = Column(String(4), nullable=False)  # CALL or PUT
     option_symbol = Column(String(50), nullable=False)
     strike = Column(Float, nullable=False)
@@ -37,13 +62,17 @@ class Trade(Base):
     entry_price = Column(Float, nullable=False)
     exit_price = Column(Float)
     quantity = Column(Integer, nullable=False)
-    status = Column(String(20), default='OPEN')  # OPEN, CLOSED, CANCELLED
-    pnl = Column(Float, default=0.0)
+    status = Column(String(20), default='OPEN', index=True)  # OPEN, CLOSED, CANCELLED
+    pnl = Column(Float, default=0.0)  # Stored rounded to cents
     open_price_ref = Column(Float)  # Reference open price that triggered trade
-    entry_time = Column(DateTime, default=datetime.utcnow)
+    entry_time = Column(DateTime, default=datetime.utcnow, index=True)
     exit_time = Column(DateTime)
     order_id = Column(String(50))
     notes = Column(String(500))
+    
+    __table_args__ = (
+        Index('ix_trades_status_entry_time', 'status', 'entry_time'),
+    )
 
 
 class BotStatus(Base):
@@ -64,7 +93,7 @@ class AdminSettings(Base):
     __tablename__ = 'admin_settings'
     
     id = Column(Integer, primary_key=True)
-    passkey = Column(String(255), nullable=False, default='admin123')
+    passkey = Column(String(255), nullable=False)  # bcrypt hash
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -94,31 +123,76 @@ class DatabaseManager:
     
     _instance = None
     _engine = None
+    _async_engine = None
     _session_factory = None
     
-    def __new__(cls, db_path=None):
+    def __new__(cls, db_path=None, db_url=None):
         if cls._instance is None:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, db_url=None):
         if self._engine is None:
-            if db_path is None:
-                from config.settings import DATABASE_PATH
-                db_path = DATABASE_PATH
+            from config.settings import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE
+            if db_url is None:
+                db_url = f'sqlite:///{db_path}' if db_path else DATABASE_URL
             
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            url = make_url(db_url)
+            engine_kwargs = {'echo': False, 'pool_pre_ping': True, 'pool_recycle': DB_POOL_RECYCLE}
+            if url.get_backend_name() == 'sqlite':
+                # Create directory if it doesn't exist
+                db_dir = os.path.dirname(url.database or '')
+                if db_dir:
+                    os.makedirs(db_dir, exist_ok=True)
+            else:
+                engine_kwargs.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
             
-            self._engine = create_engine(f'sqlite:///{db_path}', echo=False)
-            self._session_factory = sessionmaker(bind=self._engine)
+            # Sync engine for the trading engine thread, async engine for the API
+            self._engine = create_engine(url, **engine_kwargs)
+            # Sessions are short-lived and closed after each unit of work, so committed
+            # objects need not be expired/reloaded and nothing relies on autoflush
+            self._session_factory = sessionmaker(
+                bind=self._engine, autoflush=False, expire_on_commit=False
+            )
             self.Session = scoped_session(self._session_factory)
             
+            self._async_engine = create_async_engine(to_async_url(url), **engine_kwargs)
+            self.AsyncSession = async_sessionmaker(
+                self._async_engine, autoflush=False, expire_on_commit=False
+            )
+            
             # Create tables
             Base.metadata.create_all(self._engine)
+            self._ensure_indexes()
             
             # Initialize bot status if not exists
             self._init_bot_status()
+            self._round_stored_pnl()
+    
+    def _ensure_indexes(self):
+        """Create indexes added after a table was first created (create_all skips existing tables)"""
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self._engine, checkfirst=True)
+    
+    def _round_stored_pnl(self):
+        """One-off migration rounding P&L written before it was stored in cents"""
+        session = self.Session()
+        try:
+            status = session.query(BotStatus).first()
+            if (status.config or {}).get('pnl_rounded'):
+                return
+            
+            rounded = func.round(cast(Trade.pnl, Numeric), 2)
+            session.execute(
+                update(Trade).where(Trade.pnl != rounded).values(pnl=rounded),
+                execution_options={'synchronize_session': False}
+            )
+            # Reassign rather than mutate: plain JSON columns do not track in-place changes
+            status.config = {**(status.config or {}), 'pnl_rounded': True}
+            session.commit()
+        finally:
+            session.close()
     
     def _init_bot_status(self):
         """Initialize bot status record and admin settings"""
@@ -136,13 +210,16 @@ class DatabaseManager:
                 )
                 session.add(status)
             
-            # Initialize admin settings with default passkey
+            # Initialize admin settings with the hashed default passkey
             admin = session.query(AdminSettings).first()
             if not admin:
                 admin = AdminSettings(
-                    passkey='admin123'  # Default passkey
+                    passkey=hash_passkey(DEFAULT_PASSKEY)
                 )
                 session.add(admin)
+            elif not admin.passkey.startswith(BCRYPT_PREFIXES):
+                # Upgrade a passkey stored in plaintext before hashing was introduced
+                admin.passkey = hash_passkey(admin.passkey)
             
             session.commit()
         finally:
@@ -152,6 +229,10 @@ class DatabaseManager:
         """Get a new database session"""
         return self.Session()
     
+    def get_async_session(self):
+        """Get a new asyncio database session"""
+        return self.AsyncSession()
+    
     def close_session(self, session):
         """Close a database session"""
         session.close()
@@ -167,3 +248,8 @@ def get_session():
     """Get a new database session"""
     return get_db().get_session()
 
+
+def get_async_session():
+    """Get a new asyncio database session"""
+    return get_db().get_async_session()
+
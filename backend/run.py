@@ -17,7 +17,7 @@ from config.settings import (
     DAYS_TO_EXPIRATION_MIN, DAYS_TO_EXPIRATION_MAX
 )
 from models.database import DatabaseManager
-from bot.tasty_client import TastyClient
+from bot.tasty_client import get_client
 from bot.trading_engine import TradingEngine
 from api.app import app, set_bot_instance
 
@@ -55,12 +55,7 @@ class TradingBot:
                 logger.warning("TastyTrade OAuth credentials not configured. Running in demo mode.")
                 return False
             
-            self.client = TastyClient(
-                TASTY_CLIENT_SECRET,
-                TASTY_REFRESH_TOKEN,
-                TASTY_ACCOUNT_NUMBER,
-                PAPER_TRADING
-            )
+            self.client = get_client()
             
             # Connect to TastyTrade
             if not self.client.connect():
@@ -157,11 +152,18 @@ class TradingBot:
                 host='0.0.0.0',
                 port=PORT,
                 log_level='info',
-                access_log=False
+                access_log=False,
+                # uvloop where installed (not on Windows), C HTTP parser always.
+                # Single worker: the bot instance lives in this process.
+                loop='auto',
+                http='httptools'
             )
         except KeyboardInterrupt:
             logger.info("Shutting down...")
             self.stop()
+        finally:
+            if self.client:
+                self.client.close()
 
 
 def main():
@@ -0,0 +1,40 @@
+"""
+Decoding of quotes that arrived while their symbols were cold
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.tasty_client import TastyClient
+
+
+@pytest.fixture
+def client():
+    client = TastyClient('secret', 'refresh', 'ACCOUNT')
+    yield client
+    client.close()
+
+
+def feed(client, event_type, events):
+    """Deliver one COMPACT FEED_DATA frame as the WebSocket loop would"""
+    asyncio.run(client._handle_message({'type': 'FEED_DATA', 'channel': 1, 'data': [event_type, events]}))
+
+
+# The second case is an index: DXLink sends NaN bid/ask, so only the trade prices it
+@pytest.mark.parametrize('bid, ask, expected_bid, expected_ask', [
+    (449.9, 450.1, 449.9, 450.1),
+    ('NaN', 'NaN', 0.0, 0.0),
+])
+def test_trade_before_quote_keeps_last_price(client, bid, ask, expected_bid, expected_ask):
+    feed(client, 'Trade', ['Trade', 'SPY', 451.0, 100, 1000])
+    feed(client, 'Quote', ['Quote', 'SPY', bid, ask, 10, 10])
+
+    idx = client._sym2idx['SPY']
+    client._decode_raw_quotes(['SPY'])
+
+    assert client._last[idx] == 451.0
+    assert (client._bid[idx], client._ask[idx]) == (expected_bid, expected_ask)
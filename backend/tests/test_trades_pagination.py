@@ -0,0 +1,58 @@
+"""
+Keyset pagination of /api/trades
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.database import DatabaseManager, Trade
+from api.app import app, NEXT_BEFORE_HEADER, NEXT_BEFORE_ID_HEADER
+
+
+@pytest.fixture
+def client(tmp_path):
+    """API client backed by a fresh SQLite database with five trades, two sharing a timestamp"""
+    DatabaseManager._instance = None
+    db = DatabaseManager(db_path=str(tmp_path / 'test.db'))
+
+    start = datetime(2024, 1, 2, 10, 0)
+    entry_times = [start, start + timedelta(minutes=1), start + timedelta(minutes=1),
+                   start + timedelta(minutes=2), start + timedelta(minutes=3)]
+    session = db.get_session()
+    try:
+        session.add_all(
+            Trade(ticker='SPY', option_type='CALL', option_symbol='SPY', strike=500.0,
+                  expiration='2024-01-19', entry_price=1.0, quantity=1, entry_time=entry_time)
+            for entry_time in entry_times
+        )
+        session.commit()
+    finally:
+        session.close()
+
+    yield httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test')
+
+    db._engine.dispose()
+    DatabaseManager._instance = None
+
+
+@pytest.mark.asyncio
+async def test_trades_pages_follow_cursor(client):
+    async with client:
+        first = await client.get('/api/trades', params={'limit': 3})
+        second = await client.get('/api/trades', params={
+            'limit': 3,
+            'before': first.headers[NEXT_BEFORE_HEADER],
+            'before_id': first.headers[NEXT_BEFORE_ID_HEADER],
+        })
+
+    assert first.status_code == 200
+    assert [t['id'] for t in first.json()] == ['5', '4', '3']
+    assert second.status_code == 200
+    # Trade 2 shares trade 3's entry time and must not be skipped by the cursor
+    assert [t['id'] for t in second.json()] == ['2', '1']
+    assert NEXT_BEFORE_HEADER not in second.headers